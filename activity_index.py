@@ -0,0 +1,54 @@
+import pandas as pd
+import numpy as np
+import os
+
+RECENCY_DAYS = [1, 7, 30, 90]
+ACTIVE_DAYS = 30
+INACTIVE_BUCKET = len(RECENCY_DAYS)
+ACTIVITY_FILE = 'results/activity_index.csv'
+
+def utc_now():
+    return pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+def activity_buckets(last_seen, now=None):
+    now = now or utc_now()
+    days = ((now - last_seen) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.searchsorted(RECENCY_DAYS, days, side='left').astype(np.int8)
+
+def add_activity_bucket(df, now=None):
+    if 'last_seen' in df.columns:
+        df['activity_bucket'] = activity_buckets(df['last_seen'], now)
+    return df
+
+def bucket_for(days):
+    if days not in RECENCY_DAYS:
+        raise ValueError(f"Период активности должен быть одним из {RECENCY_DAYS} дней, получено: {days}")
+    return RECENCY_DAYS.index(days)
+
+def active_audience(df, days=ACTIVE_DAYS):
+    if days is None or 'activity_bucket' not in df.columns:
+        return df
+    return df[df['activity_bucket'] <= bucket_for(days)]
+
+def recency_counts(df):
+    counts = {f'active_{days}d': 0 for days in RECENCY_DAYS}
+    if 'activity_bucket' in df.columns:
+        cumulative = np.bincount(df['activity_bucket'], minlength=INACTIVE_BUCKET + 1).cumsum()
+        counts = {f'active_{days}d': int(cumulative[i]) for i, days in enumerate(RECENCY_DAYS)}
+    counts['total'] = int(len(df))
+    return counts
+
+def update_activity_index(group, df):
+    os.makedirs('results', exist_ok=True)
+    index = load_activity_index()
+    if index is None:
+        index = pd.DataFrame(columns=[f'active_{days}d' for days in RECENCY_DAYS] + ['total'])
+    index.loc[group] = recency_counts(df)
+    index.index.name = 'group'
+    index.to_csv(ACTIVITY_FILE)
+    return index
+
+def load_activity_index():
+    if not os.path.exists(ACTIVITY_FILE):
+        return None
+    return pd.read_csv(ACTIVITY_FILE, index_col='group')
@@ -1,36 +1,44 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
-from scipy import stats
+from interactions import load_interactions
+from plotting import load_plotting
+from subscriber_schema import apply_subscriber_schema
+from subscriber_cache import load_subscribers
+from activity_index import add_activity_bucket, active_audience, update_activity_index
+from post_store import MAIN_GROUP
+from distributions import AGE_GRID, age_histogram, kde_curves, load_age_histograms, save_age_histogram
+from geo_index import top_cities, city_comparison, with_labels
 
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-os.makedirs('graphs', exist_ok=True)
+AGE_BINS = [13, 17, 24, 34, 44, 54, 80]
+AGE_LABELS = ['14-17', '18-24', '25-34', '35-44', '45-54', '55+']
 
 class AudienceAnalyzer:
     def __init__(self):
         self.df = self.load_and_clean_data()
     
     def load_and_clean_data(self):
-        df = pd.read_csv('subscribers.csv')
+        df = load_subscribers('subscribers.csv')
         df = df[df['first_name'] != 'DELETED']
-        df['age'] = pd.to_numeric(df['age'], errors='coerce')
         df = df[(df['age'] >= 14) & (df['age'] <= 80)]
         gender_map = {1: 'Женский', 2: 'Мужской'}
         df['gender'] = df['sex'].map(gender_map)
+        df = add_activity_bucket(apply_subscriber_schema(df))
+        update_activity_index(MAIN_GROUP, df)
+        save_age_histogram(MAIN_GROUP, age_histogram(df['age']))
         df.to_csv('subscribers_cleaned.csv', index=False)
         return df
     
-    def plot_demographics(self):
+    def plot_demographics(self, active_days=None):
+        plt, sns = load_plotting()
+        df = active_audience(self.df, active_days)
         plt.figure(figsize=(8, 5))
-        self.df['gender'].value_counts().plot(kind='pie', autopct='%1.1f%%')
+        df['gender'].value_counts().plot(kind='pie', autopct='%1.1f%%')
         plt.title('Распределение по полу')
         plt.savefig('graphs/gender_distribution.png')
         plt.close()
         
         plt.figure(figsize=(10, 6))
-        sns.histplot(self.df['age'], bins=20, kde=True)
+        sns.histplot(df['age'], bins=20, kde=True)
         plt.title('Распределение по возрасту')
         plt.xlabel('Возраст')
         plt.ylabel('Количество подписчиков')
@@ -38,46 +46,49 @@ class AudienceAnalyzer:
         plt.close()
         
         plt.figure(figsize=(10, 6))
-        self.df['city'].value_counts().head(10).plot(kind='barh')
+        with_labels(top_cities(MAIN_GROUP, 10, active_days)).plot(kind='barh')
         plt.title('Топ-10 городов')
         plt.xlabel('Количество подписчиков')
         plt.tight_layout()
         plt.savefig('graphs/city_distribution.png')
         plt.close()
     
-    def compare_with_competitors(self):
-        competitors = []
+    def competitor_histograms(self, active_days=None):
+        if active_days is None:
+            cached = load_age_histograms().drop(index=MAIN_GROUP, errors='ignore')
+            if not cached.empty:
+                return cached
+        histograms = {}
         for file in os.listdir('competitors_data'):
             if file.endswith('_subscribers.csv'):
-                df = pd.read_csv(f'competitors_data/{file}')
-                competitors.append({
-                    'name': file.replace('_audience.csv', ''),
-                    'data': df
-                })
+                df = add_activity_bucket(load_subscribers(f'competitors_data/{file}', columns=['age', 'last_seen']))
+                df = active_audience(df, active_days)
+                histograms[file.replace('_subscribers.csv', '')] = age_histogram(df['age'])
+        return pd.DataFrame.from_dict(histograms, orient='index', columns=AGE_GRID)
+    
+    def compare_with_competitors(self, active_days=None):
+        plt, sns = load_plotting()
+        our = active_audience(self.df, active_days)
+        competitors = self.competitor_histograms(active_days)
         
-        if not competitors:
+        if competitors.empty:
             print("Нет данных конкурентов для сравнения")
             return
         
+        histograms = pd.concat([pd.DataFrame([age_histogram(our['age'])], index=['Laser33'], columns=AGE_GRID), competitors])
+        curves = kde_curves(histograms)
         plt.figure(figsize=(12, 6))
-        sns.kdeplot(self.df['age'], label='Laser33', linewidth=3)
-        for comp in competitors:
-            sns.kdeplot(comp['data']['age'], label=comp['name'])
+        for name in curves.columns:
+            plt.plot(AGE_GRID, curves[name], label=name, linewidth=3 if name == 'Laser33' else 1.5)
         plt.title('Сравнение возрастного распределения')
         plt.xlabel('Возраст')
         plt.legend()
         plt.savefig('graphs/age_comparison.png')
         plt.close()
         
-        top_cities = self.df['city'].value_counts().head(5).index
-        city_data = []
-        for city in top_cities:
-            row = {'city': city, 'Laser33': sum(self.df['city'] == city)}
-            for comp in competitors:
-                row[comp['name']] = sum(comp['data']['city'] == city)
-            city_data.append(row)
-        
-        df_cities = pd.DataFrame(city_data).set_index('city')
+        names = list(competitors.index)
+        df_cities = city_comparison(MAIN_GROUP, 5, active_days).reindex(columns=[MAIN_GROUP] + names, fill_value=0)
+        df_cities = with_labels(df_cities).rename(columns={MAIN_GROUP: 'Laser33'})
         df_cities.plot(kind='bar', figsize=(12, 6))
         plt.title('Сравнение по городам')
         plt.ylabel('Количество подписчиков')
@@ -87,32 +98,47 @@ class AudienceAnalyzer:
         plt.close()
     
     def analyze_engagement(self):
-        if not os.path.exists('results/posts_stats.csv'):
-            print("Нет данных по постам")
+        interactions = load_interactions()
+        if interactions is None:
+            print("Нет данных о взаимодействиях с постами")
             return
         
-        posts = pd.read_csv('results/posts_stats.csv')
-        posts['engagement'] = posts['likes'] + posts['reposts']*2
+        audience = self.df[['id', 'age', 'gender', 'city']].copy()
+        audience['age_group'] = pd.cut(audience['age'], bins=AGE_BINS, labels=AGE_LABELS)
+        audience = audience.drop(columns='age').set_index('id')
         
-        merged = pd.merge(
-            self.df[['id', 'age']], 
-            posts, 
-            left_on='id', 
-            right_on='post_id', 
-            how='inner'
-        )
+        merged = interactions.join(audience, on='user_id', how='inner')
+        print(f"Взаимодействий подписчиков: {len(merged)} из {len(interactions)}")
+        if merged.empty:
+            return
         
-        plt.figure(figsize=(10, 6))
-        sns.regplot(x='age', y='engagement', data=merged)
-        plt.title('Зависимость вовлеченности от возраста')
-        plt.savefig('graphs/age_engagement.png')
-        plt.close()
+        plt, sns = load_plotting()
+        
+        keys = ['age_group', 'gender', 'city']
+        cube = merged.groupby(keys, observed=True).size().rename('interactions')
+        base = audience.groupby(keys, observed=True).size().rename('subscribers')
+        cube = pd.concat([cube, base], axis=1).fillna(0)
+        cube.to_csv('results/engagement_by_demographics.csv')
+        
+        for key, title in [('age_group', 'возрастной группы'), ('gender', 'пола'), ('city', 'города')]:
+            totals = cube.groupby(level=key, observed=True).sum()
+            rate = (totals['interactions'] / totals['subscribers']).dropna()
+            if key == 'city':
+                rate = rate[totals['subscribers'] >= 10].nlargest(10)
+            plt.figure(figsize=(10, 6))
+            rate.plot(kind='bar')
+            plt.title(f'Вовлеченность в зависимости от {title}')
+            plt.ylabel('Взаимодействий на подписчика')
+            plt.xticks(rotation=45)
+            plt.tight_layout()
+            plt.savefig(f'graphs/{key}_engagement.png')
+            plt.close()
     
-    def run_full_analysis(self):
+    def run_full_analysis(self, active_days=None):
         print("Анализ демографии...")
-        self.plot_demographics()
+        self.plot_demographics(active_days)
         print("\nСравнение с конкурентами...")
-        self.compare_with_competitors()
+        self.compare_with_competitors(active_days)
         print("\nАнализ вовлеченности...")
         self.analyze_engagement()
         print("\nВсе графики сохранены в папке graphs")
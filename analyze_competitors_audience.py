@@ -1,19 +1,19 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
 from datetime import datetime
 import json
 import numpy as np
-
-os.makedirs('competitors_clean', exist_ok=True)
-os.makedirs('graphs/competitors', exist_ok=True)
+from subscriber_schema import read_subscribers, apply_subscriber_schema
+from plotting import load_plotting
+from distributions import AGE_GRID, age_histogram, save_age_histogram
+from activity_index import add_activity_bucket, active_audience, recency_counts, update_activity_index
+from geo_index import top_cities, with_labels
 
 def clean_competitor_data(raw_file):
-    df = pd.read_csv(raw_file)
+    df = read_subscribers(raw_file)
     df = df[df['first_name'] != 'DELETED']
     
     if 'age' in df.columns:
-        df['age'] = pd.to_numeric(df['age'], errors='coerce')
         df = df[(df['age'] >= 15) & (df['age'] <= 80)]
     else:
         df['age'] = None
@@ -22,9 +22,12 @@ def clean_competitor_data(raw_file):
         gender_map = {1: 'Женский', 2: 'Мужской', 0: 'Не указан'}
         df['gender'] = df['sex'].map(gender_map)
     
+    df = add_activity_bucket(apply_subscriber_schema(df))
+    
     meta = {
         'cleaned_at': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'total_users': int(len(df))
+        'total_users': int(len(df)),
+        'recency': recency_counts(df)
     }
     
     if 'age' in df.columns and not df['age'].isnull().all():
@@ -36,10 +39,11 @@ def clean_competitor_data(raw_file):
     
     return df, meta
 
-def visualize_competitor_data(df, competitor_name):
+def visualize_competitor_data(df, competitor_name, active_days=None):
+    plt, _ = load_plotting('graphs/competitors', style=False)
     if 'age' in df.columns and not df['age'].isnull().all():
         plt.figure(figsize=(10, 6))
-        df['age'].hist(bins=20, rwidth=0.8)
+        plt.bar(AGE_GRID, age_histogram(df['age']), width=0.8)
         plt.title(f'Распределение возраста: {competitor_name}')
         plt.xlabel('Возраст')
         plt.ylabel('Количество')
@@ -53,14 +57,16 @@ def visualize_competitor_data(df, competitor_name):
         plt.savefig(f'graphs/competitors/{competitor_name}_gender.png')
         plt.close()
     
-    if 'city' in df.columns:
+    cities = top_cities(competitor_name, 10, active_days)
+    if not cities.empty:
         plt.figure(figsize=(10, 6))
-        df['city'].value_counts().head(10).plot(kind='barh')
+        with_labels(cities).plot(kind='barh')
         plt.title(f'Топ-10 городов: {competitor_name}')
         plt.savefig(f'graphs/competitors/{competitor_name}_cities.png')
         plt.close()
 
-def process_all_competitors():
+def process_all_competitors(active_days=None, plot=True):
+    os.makedirs('competitors_clean', exist_ok=True)
     competitors_stats = {}
     
     for file in os.listdir('competitors_data'):
@@ -76,13 +82,20 @@ def process_all_competitors():
                 with open(f'competitors_clean/{competitor_name}_meta.json', 'w', encoding='utf-8') as f:
                     json.dump(meta, f, ensure_ascii=False, indent=2)
                 
-                visualize_competitor_data(df, competitor_name)
+                update_activity_index(competitor_name, df)
+                save_age_histogram(competitor_name, age_histogram(df['age']))
+                active = active_audience(df, active_days)
+                if plot:
+                    visualize_competitor_data(active, competitor_name, active_days)
                 
+                gender_counts = active['gender'].value_counts() if 'gender' in active.columns else {}
                 simple_meta = {
                     'total_users': meta['total_users'],
-                    'age_mean': meta.get('age_mean', None),
-                    'male_count': meta.get('gender_distribution', {}).get('Мужской', 0),
-                    'female_count': meta.get('gender_distribution', {}).get('Женский', 0)
+                    'audience_users': int(len(active)),
+                    'age_mean': float(active['age'].mean()) if active['age'].notna().any() else None,
+                    'male_count': int(gender_counts.get('Мужской', 0)),
+                    'female_count': int(gender_counts.get('Женский', 0)),
+                    **{k: v for k, v in meta['recency'].items() if k != 'total'}
                 }
                 competitors_stats[competitor_name] = simple_meta
                 
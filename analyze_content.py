@@ -1,17 +1,17 @@
-import vk_api
 from datetime import datetime
 import pandas as pd
 import re
 import os
 from collections import defaultdict
-import matplotlib.pyplot as plt
-import seaborn as sns
+from itertools import islice
+from plotting import load_plotting
+from post_store import MAIN_GROUP, normalize_posts
+from timeseries import load_rollup, update_rollups
+from wall_iterator import iter_wall, PAGE_SIZE
 
 TOKEN = 'ТОКЕН'
 VERSION = '5.131'
 GROUP_ID = -165542199
-os.makedirs('results', exist_ok=True)
-os.makedirs('graphs/content', exist_ok=True)
 
 class ContentAnalyzer:
     def __init__(self):
@@ -19,16 +19,10 @@ class ContentAnalyzer:
     
     def get_all_posts(self, count=100):
         try:
+            import vk_api
             vk_session = vk_api.VkApi(token=TOKEN)
-            vk = vk_session.get_api()
-            posts = vk.wall.get(
-                owner_id=GROUP_ID,
-                count=count,
-                extended=1,
-                fields='attachments',
-                v=VERSION
-            )
-            return posts.get('items', [])
+            posts = iter_wall(vk_session, GROUP_ID, page_size=min(count, PAGE_SIZE), params={'extended': 1, 'fields': 'attachments'})
+            return list(islice(posts, count))
         except Exception as e:
             print(f"Ошибка API: {e}")
             return []
@@ -97,6 +91,7 @@ class ContentAnalyzer:
         return pd.DataFrame(processed)
 
     def visualize_content(self, df):
+        plt, _ = load_plotting('graphs/content', style=False)
         plt.figure(figsize=(10, 6))
         df['content_type'].value_counts().plot(
             kind='pie',
@@ -137,8 +132,11 @@ class ContentAnalyzer:
         plt.savefig('graphs/content/likes_by_type.png', dpi=300)
         plt.close()
         
-        df['week'] = df['date'].dt.strftime('%Y-%U')
-        weekly = df.groupby('week').size()
+        rollup = load_rollup(MAIN_GROUP, 'weekly')
+        if rollup is None:
+            return
+        weekly = rollup['posts']
+        weekly.index = weekly.index.strftime('%Y-%m-%d')
         plt.figure(figsize=(12, 6))
         weekly.plot(kind='bar', color='#4c72b0')
         plt.title('Количество постов по неделям')
@@ -149,6 +147,7 @@ class ContentAnalyzer:
         plt.close()
     
     def compare_with_competitors(self):
+        plt, _ = load_plotting('graphs/content', style=False)
         competitors = []
         for file in os.listdir('competitors_data'):
             if file.endswith('_content.csv'):
@@ -189,10 +188,15 @@ class ContentAnalyzer:
     
     def run_analysis(self):
         print("Анализ контента...")
+        os.makedirs('results', exist_ok=True)
         df = self.analyze_posts()
         df.to_csv('results/posts_stats.csv', index=False, encoding='utf-8-sig')
         print(f"Сохранено {len(df)} постов в results/posts_stats.csv")
-        self.visualize_content(df)
+        if df.empty:
+            print("Нет постов для анализа")
+        else:
+            update_rollups(MAIN_GROUP, normalize_posts(df))
+            self.visualize_content(df)
         self.compare_with_competitors()
         print("Графики сохранены в graphs/content/")
 
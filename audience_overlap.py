@@ -0,0 +1,135 @@
+import pandas as pd
+import numpy as np
+import os
+from post_store import MAIN_GROUP
+
+MAIN_SUBSCRIBERS_FILE = 'subscribers.csv'
+COMPETITORS_DIR = 'competitors_data'
+OVERLAP_FILE = 'results/audience_overlap.csv'
+REACH_FILE = 'results/audience_reach.csv'
+SKETCH_SIZE = 4096
+EXACT_LIMIT = 2_000_000
+HASH_MAX = float(2**64)
+
+def load_member_ids(path):
+    ids = pd.read_csv(path, usecols=['id'])['id'].dropna()
+    return np.unique(ids.to_numpy(dtype=np.int64))
+
+def load_all_member_ids():
+    groups = {}
+    if os.path.exists(MAIN_SUBSCRIBERS_FILE):
+        groups[MAIN_GROUP] = load_member_ids(MAIN_SUBSCRIBERS_FILE)
+    if os.path.exists(COMPETITORS_DIR):
+        for file in sorted(os.listdir(COMPETITORS_DIR)):
+            if file.endswith('_subscribers.csv'):
+                groups[file.replace('_subscribers.csv', '')] = load_member_ids(f'{COMPETITORS_DIR}/{file}')
+    return groups
+
+def exact_overlap(groups):
+    from scipy import sparse
+    names = list(groups)
+    ids = np.concatenate([groups[name] for name in names])
+    group_idx = np.repeat(np.arange(len(names)), [len(groups[name]) for name in names])
+    _, user_idx = np.unique(ids, return_inverse=True)
+    membership = sparse.csr_matrix(
+        (np.ones(len(ids), dtype=np.int32), (user_idx, group_idx)),
+        shape=(user_idx.max() + 1, len(names))
+    )
+    intersections = (membership.T @ membership).toarray().astype(np.int64)
+    exclusive = np.asarray(membership.sum(axis=1)).ravel() == 1
+    unique_reach = np.bincount(group_idx[exclusive[user_idx]], minlength=len(names))
+    return names, intersections, unique_reach
+
+def hash_ids(ids):
+    x = ids.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def bottom_k(hashes, k=SKETCH_SIZE):
+    if len(hashes) <= k:
+        return np.sort(hashes)
+    return np.sort(np.partition(hashes, k - 1)[:k])
+
+def sketch_cardinality(sketch, k=SKETCH_SIZE):
+    if len(sketch) < k:
+        return float(len(sketch))
+    return (k - 1) / (sketch[k - 1] / HASH_MAX)
+
+def estimated_overlap(groups, k=SKETCH_SIZE):
+    names = list(groups)
+    sketches = [bottom_k(hash_ids(groups[name]), k) for name in names]
+    sizes = np.array([len(groups[name]) for name in names], dtype=np.float64)
+    intersections = np.diag(sizes)
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            union = bottom_k(np.union1d(sketches[i], sketches[j]), k)
+            shared = np.isin(union, sketches[i]) & np.isin(union, sketches[j])
+            jaccard = shared.sum() / len(union)
+            intersections[i, j] = intersections[j, i] = jaccard * (sizes[i] + sizes[j]) / (1 + jaccard)
+    unique_reach = np.zeros(len(names))
+    for i in range(len(names)):
+        others = [sketches[j] for j in range(len(names)) if j != i]
+        if not others:
+            unique_reach[i] = sizes[i]
+            continue
+        others_union = bottom_k(np.unique(np.concatenate(others)), k)
+        with_group = bottom_k(np.union1d(others_union, sketches[i]), k)
+        unique_reach[i] = max(sketch_cardinality(with_group, k) - sketch_cardinality(others_union, k), 0)
+    return names, intersections.round().astype(np.int64), unique_reach.round().astype(np.int64)
+
+def compute_overlap(groups, estimate=None):
+    if estimate is None:
+        estimate = max(len(ids) for ids in groups.values()) > EXACT_LIMIT
+    if estimate:
+        names, intersections, unique_reach = estimated_overlap(groups)
+    else:
+        names, intersections, unique_reach = exact_overlap(groups)
+    sizes = np.diag(intersections)
+    jaccard = intersections / (sizes[:, None] + sizes[None, :] - intersections)
+    overlap = pd.DataFrame(intersections, index=names, columns=names)
+    reach = pd.DataFrame({
+        'members': sizes,
+        'unique_reach': unique_reach
+    }, index=names)
+    if MAIN_GROUP in overlap.index:
+        reach['shared_with_main'] = overlap[MAIN_GROUP]
+        reach['new_reach'] = reach['members'] - reach['shared_with_main']
+        reach['jaccard_with_main'] = jaccard[:, names.index(MAIN_GROUP)].round(4)
+    return overlap, reach, pd.DataFrame(jaccard, index=names, columns=names)
+
+def load_reach():
+    if not os.path.exists(REACH_FILE):
+        return None
+    return pd.read_csv(REACH_FILE, index_col=0)
+
+def plot_overlap(overlap):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    share = overlap.div(np.diag(overlap), axis=0) * 100
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(share, annot=True, fmt='.1f', cmap='Blues')
+    plt.title('Доля подписчиков группы (строка), состоящих в группе (столбец), %')
+    plt.tight_layout()
+    plt.savefig('graphs/audience_overlap.png')
+    plt.close()
+
+def main(estimate=None, plot=True):
+    os.makedirs('results', exist_ok=True)
+    os.makedirs('graphs', exist_ok=True)
+    groups = load_all_member_ids()
+    if len(groups) < 2:
+        print("Недостаточно групп для анализа пересечения аудиторий")
+        return
+    overlap, reach, jaccard = compute_overlap(groups, estimate)
+    overlap.to_csv(OVERLAP_FILE)
+    jaccard.round(4).to_csv('results/audience_jaccard.csv')
+    reach.to_csv(REACH_FILE)
+    print("\nПересечение аудиторий:")
+    print(reach)
+    if plot:
+        plot_overlap(overlap)
+        print("\nГрафик сохранён в graphs/audience_overlap.png")
+
+if __name__ == "__main__":
+    main()
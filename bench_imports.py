@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import time
+
+MODULES = [
+    'cli',
+    'post_store',
+    'subscriber_schema',
+    'activity_index',
+    'timeseries',
+    'posting_time',
+    'group_metrics',
+    'audience_overlap',
+    'interests_engine',
+    'report',
+    'dedup',
+    'wall_iterator',
+    'geo_index',
+    'sampling',
+    'subscriber_cache',
+    'interactions',
+    'collect_data',
+    'analyze_audience',
+    'analyze_competitors_audience',
+    'analyze_content',
+    'analyze_competitors_content',
+    'analyze_interests',
+    'build_strategy',
+    'compare_with_competitors',
+    'visualize',
+    'visualize_comparison'
+]
+HEAVY = ['matplotlib', 'seaborn', 'scipy', 'vk_api', 'wordcloud', 'tqdm']
+REPEATS = 3
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ','.join(heavy))
+'''
+
+def measure(module):
+    timings = []
+    heavy = ''
+    for _ in range(REPEATS):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        heavy = output[1] if len(output) > 1 else ''
+    return min(timings), heavy
+
+def main():
+    start = time.perf_counter()
+    print(f"{'Модуль':32} {'Импорт, мс':>10}  Тяжёлые библиотеки")
+    for module in MODULES:
+        elapsed, heavy = measure(module)
+        print(f"{module:32} {elapsed * 1000:10.1f}  {heavy or '-'}")
+    print(f"\nВсего: {time.perf_counter() - start:.1f} с")
+
+if __name__ == "__main__":
+    main()
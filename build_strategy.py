@@ -2,12 +2,23 @@ import pandas as pd
 from collections import Counter
 import re
 import json
-import matplotlib.pyplot as plt
 import os
+from post_store import MAIN_GROUP, normalize_posts
+from posting_time import load_posting_model, best_hours, best_days, best_slots, WEEKDAYS
+from audience_overlap import load_reach
+from subscriber_cache import load_subscribers
+from group_metrics import load_group_metrics, load_group_sizes, compute_group_metrics
+
+STRATEGY_FILE = 'results/strategy.json'
+CONTENT_PATTERNS = {
+    'case_study': 'кейс|пример',
+    'educational': 'обучен|технолог',
+    'promo': 'акци|скидк'
+}
 
 def load_data():
     data = {
-        'subscribers': pd.read_csv('subscribers_cleaned.csv'),
+        'subscribers': load_subscribers('subscribers_cleaned.csv'),
         'posts': pd.read_csv('results/posts_stats.csv'),
         'competitors': []
     }
@@ -18,7 +29,7 @@ def load_data():
             if file.endswith('_clean.csv'):
                 name = file.replace('_clean.csv', '')
                 try:
-                    df = pd.read_csv(f'{competitors_dir}/{file}')
+                    df = load_subscribers(f'{competitors_dir}/{file}')
                     stats_file = f'{competitors_dir}/{name}_meta.json'
                     stats = {}
                     if os.path.exists(stats_file):
@@ -48,6 +59,34 @@ def analyze_interests(df):
     words = re.findall(r'\b[а-яa-zё]{3,}\b', all_interests.lower())
     return Counter(words)
 
+def build_group_features(data):
+    frames = [normalize_posts(data['posts']).assign(group=MAIN_GROUP)]
+    for comp in data['competitors']:
+        if comp.get('content') is not None:
+            frames.append(normalize_posts(comp['content']).assign(group=comp['name']))
+    posts = pd.concat(frames, ignore_index=True)
+    
+    text = posts['text'].fillna('').astype(str).str.lower()
+    for content_type, pattern in CONTENT_PATTERNS.items():
+        posts[content_type] = text.str.contains(pattern, regex=True)
+    
+    features = posts.groupby('group').agg(
+        posts=('id', 'size'),
+        avg_likes=('likes', 'mean'),
+        avg_reposts=('reposts', 'mean'),
+        engagement=('engagement', 'mean'),
+        **{content_type: (content_type, 'mean') for content_type in CONTENT_PATTERNS}
+    )
+    
+    hours = pd.crosstab(posts['group'], posts['date'].dt.hour, normalize='index')
+    features['peak_hour'] = hours.idxmax(axis=1)
+    features = features.join(hours.add_prefix('hour_'))
+    
+    audience = {c['name']: c['stats'].get('total_users') for c in data['competitors']}
+    audience[MAIN_GROUP] = len(data['subscribers'])
+    features['audience'] = pd.Series(audience, dtype='float64')
+    return features
+
 def generate_content_strategy(data):
     strategy = {
         'content_types': [],
@@ -56,60 +95,64 @@ def generate_content_strategy(data):
         'kpi': {}
     }
     
-    our_posts = data['posts']
-    our_engagement = our_posts['likes'].mean() + our_posts['reposts'].mean()*2
-    
-    content_types = {
-        'case_study': len(our_posts[our_posts['text'].str.contains('кейс|пример', case=False, na=False)]),
-        'educational': len(our_posts[our_posts['text'].str.contains('обучен|технолог', case=False, na=False)]),
-        'promo': len(our_posts[our_posts['text'].str.contains('акци|скидк', case=False, na=False)])
-    }
+    features = build_group_features(data)
+    features.to_csv('results/group_features.csv', encoding='utf-8-sig')
+    ours = features.loc[MAIN_GROUP]
+    stronger = features[(features.index != MAIN_GROUP) & (features['engagement'] > ours['engagement'])]
+    
+    for name in stronger.index[stronger['case_study'] > ours['case_study']]:
+        strategy['content_types'].append(f"Увеличить долю кейсов (как у {name})")
+    for name in stronger.index[stronger['educational'] > ours['educational']]:
+        strategy['content_types'].append(f"Добавить обучающих материалов (как у {name})")
+    
+    model = load_posting_model()
+    if model is not None:
+        strategy['posting_schedule']['best_hours'] = best_hours(model)
+        strategy['posting_schedule']['best_days'] = best_days(model)
+        strategy['posting_schedule']['best_slots'] = [
+            f"{WEEKDAYS[day]} {hour}:00" for day, hour in best_slots(model)
+        ]
+    else:
+        strategy['posting_schedule']['best_hours'] = [12, 18, 20]
+        strategy['posting_schedule']['best_days'] = ['Вт', 'Чт', 'Сб']
     
-    for comp in data['competitors']:
-        if comp.get('content') is not None:
-            try:
-                comp_engagement = comp['content']['likes'].mean() + comp['content']['reposts'].mean()*2
-                if comp_engagement > our_engagement:
-                    comp_content = comp['content']
-                    comp_case = len(comp_content[comp_content['text'].str.contains('кейс|пример', case=False, na=False)])
-                    comp_edu = len(comp_content[comp_content['text'].str.contains('обучен|технолог', case=False, na=False)])
-                    
-                    if comp_case > content_types['case_study']:
-                        strategy['content_types'].append(f"Увеличить долю кейсов (как у {comp['name']})")
-                    if comp_edu > content_types['educational']:
-                        strategy['content_types'].append(f"Добавить обучающих материалов (как у {comp['name']})")
-            except:
-                continue
-    
-    if 'date' in our_posts.columns:
-        try:
-            our_posts['hour'] = pd.to_datetime(our_posts['date']).dt.hour
-            best_hours = our_posts.groupby('hour')['likes'].mean().nlargest(3).index.tolist()
-            strategy['posting_schedule']['best_hours'] = best_hours
-        except:
-            strategy['posting_schedule']['best_hours'] = [12, 18, 20]
-    
-    strategy['posting_schedule']['best_days'] = ['Вт', 'Чт', 'Сб']
-    
-    if data['competitors']:
-        top_competitors = sorted(
-            [c for c in data['competitors'] if 'stats' in c and 'total_users' in c['stats']],
-            key=lambda x: x['stats']['total_users'],
-            reverse=True
-        )[:2]
+    reach = load_reach()
+    if reach is not None and 'new_reach' in reach.columns:
+        candidates = reach.drop(index=MAIN_GROUP, errors='ignore').nlargest(2, 'new_reach')
+        strategy['collaborations'] = [
+            f"Кросс-посты с {name} (новый охват {int(row['new_reach'])}, "
+            f"пересечение {row['shared_with_main'] / row['members'] * 100:.1f}%)"
+            for name, row in candidates.iterrows()
+        ]
+    else:
+        top_competitors = features.drop(index=MAIN_GROUP)['audience'].dropna().nlargest(2)
         strategy['collaborations'] = [
-            f"Кросс-посты с {comp['name']}" for comp in top_competitors
+            f"Кросс-посты с {name}" for name in top_competitors.index
         ]
     
-    strategy['kpi'] = {
-        'target_er': round(our_engagement * 1.3, 1),
+    metrics = load_group_metrics()
+    if metrics is None or MAIN_GROUP not in metrics.index:
+        sizes = load_group_sizes()
+        if MAIN_GROUP in sizes:
+            metrics = compute_group_metrics(normalize_posts(data['posts']).assign(group=MAIN_GROUP), sizes)
+    
+    if metrics is not None and MAIN_GROUP in metrics.index:
+        current_er = float(metrics.loc[MAIN_GROUP, 'er'])
+        strategy['kpi'].update({
+            'current_er': round(current_er, 2),
+            'target_er': round(current_er * 1.3, 2)
+        })
+    else:
+        print("Нет размеров сообщества: ER в KPI не рассчитан")
+    strategy['kpi'].update({
         'new_subscribers': 150,
         'timeframe': '3 месяца'
-    }
+    })
     
     return strategy
 
 def visualize_strategy(strategy):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 4))
     pd.Series({
         'Кейсы': 35,
@@ -123,7 +166,7 @@ def visualize_strategy(strategy):
     plt.savefig('graphs/strategy_content_types.png')
     plt.close()
 
-def main():
+def main(plot=True):
     os.makedirs('graphs', exist_ok=True)
     os.makedirs('competitors_data', exist_ok=True)
     
@@ -141,6 +184,8 @@ def main():
     
     print("\nГенерация стратегии...")
     strategy = generate_content_strategy(data)
+    with open(STRATEGY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(strategy, f, ensure_ascii=False, indent=2)
     
     print("\nСТРАТЕГИЯ РАЗВИТИЯ СООБЩЕСТВА:")
     print("\n1. Рекомендации по контенту:")
@@ -150,6 +195,8 @@ def main():
     print("\n2. Лучшее время для публикаций:")
     print(f"- Часы: {', '.join(map(str, strategy['posting_schedule'].get('best_hours', [])))}")
     print(f"- Дни: {', '.join(strategy['posting_schedule'].get('best_days', []))}")
+    if strategy['posting_schedule'].get('best_slots'):
+        print(f"- Лучшие слоты: {', '.join(strategy['posting_schedule']['best_slots'])}")
     
     print("\n3. Коллаборации:")
     for collab in strategy['collaborations'] or ["Недостаточно данных для рекомендаций"]:
@@ -159,8 +206,9 @@ def main():
     for k, v in strategy['kpi'].items():
         print(f"- {k}: {v}")
     
-    visualize_strategy(strategy)
-    print("\nГрафики стратегии сохранены в папке graphs")
+    if plot:
+        visualize_strategy(strategy)
+        print("\nГрафики стратегии сохранены в папке graphs")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,114 @@
+import argparse
+
+def active_days(value):
+    from activity_index import RECENCY_DAYS
+    days = int(value)
+    if days not in RECENCY_DAYS:
+        raise argparse.ArgumentTypeError(f"допустимые значения: {', '.join(map(str, RECENCY_DAYS))}")
+    return days
+
+def run_collect(args):
+    from collect_data import VKDataCollector, TOKEN, VERSION
+    collector = VKDataCollector(TOKEN, VERSION)
+    collector.collect_all_data(args.sample_error, args.confidence)
+    if args.interactions:
+        import interactions
+        interactions.main()
+
+def run_clean(args):
+    from analyze_audience import AudienceAnalyzer
+    from analyze_competitors_audience import process_all_competitors
+    AudienceAnalyzer()
+    print("Очищенные данные сохранены в subscribers_cleaned.csv")
+    process_all_competitors(args.active_days, plot=args.plots)
+
+def run_content(args):
+    from analyze_content import ContentAnalyzer
+    import analyze_competitors_content
+    ContentAnalyzer().run_analysis()
+    analyze_competitors_content.main()
+
+def run_compare(args):
+    import audience_overlap
+    import geo_index
+    import visualize_comparison
+    audience_overlap.main(plot=args.plots)
+    geo_index.main()
+    if args.plots:
+        visualize_comparison.main()
+    if args.sizes:
+        import compare_with_competitors
+        compare_with_competitors.main()
+
+def run_dedup(args):
+    import dedup
+    dedup.main()
+
+def run_strategy(args):
+    import build_strategy
+    build_strategy.main(plot=args.plots)
+
+def run_interests(args):
+    import interests_engine
+    interests_engine.main(args.segments)
+
+def run_report(args):
+    from report import build_report
+    build_report()
+
+def run_plots(args):
+    from analyze_audience import AudienceAnalyzer
+    import analyze_interests
+    import visualize
+    AudienceAnalyzer().run_full_analysis(args.active_days)
+    analyze_interests.main()
+    visualize.main()
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Анализ сообщества laser33 и конкурентов ВКонтакте')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collect = subparsers.add_parser('collect', help='Сбор подписчиков основной группы и конкурентов')
+    collect.add_argument('--interactions', action='store_true', help='Собрать лайки и комментарии к постам')
+    collect.add_argument('--sample-error', type=float, default=None, help='Быстрая выборка конкурентов с заданной погрешностью (например, 0.03)')
+    collect.add_argument('--confidence', type=float, default=0.95, help='Доверительный уровень для выборки')
+    collect.set_defaults(func=run_collect)
+
+    clean = subparsers.add_parser('clean', help='Очистка данных подписчиков')
+    clean.add_argument('--active-days', type=active_days, default=None, help='Учитывать только активных за N дней')
+    clean.add_argument('--plots', action='store_true', help='Построить графики по конкурентам')
+    clean.set_defaults(func=run_clean)
+
+    content = subparsers.add_parser('content', help='Сбор и анализ постов')
+    content.set_defaults(func=run_content)
+
+    compare = subparsers.add_parser('compare', help='Сравнение с конкурентами')
+    compare.add_argument('--no-plots', dest='plots', action='store_false', help='Только таблицы, без графиков')
+    compare.add_argument('--sizes', action='store_true', help='Обновить размеры сообществ')
+    compare.set_defaults(func=run_compare)
+
+    dedup = subparsers.add_parser('dedup', help='Поиск повторяющихся и перепощенных постов')
+    dedup.set_defaults(func=run_dedup)
+
+    strategy = subparsers.add_parser('strategy', help='Генерация стратегии')
+    strategy.add_argument('--no-plots', dest='plots', action='store_false', help='Не строить графики')
+    strategy.set_defaults(func=run_strategy)
+
+    interests = subparsers.add_parser('interests', help='Сегментация подписчиков по интересам')
+    interests.add_argument('--segments', type=int, default=8, help='Количество сегментов')
+    interests.set_defaults(func=run_interests)
+
+    report = subparsers.add_parser('report', help='HTML-отчёт по сохранённым агрегатам')
+    report.set_defaults(func=run_report)
+
+    plots = subparsers.add_parser('plots', help='Графики по аудитории и интересам')
+    plots.add_argument('--active-days', type=active_days, default=None, help='Учитывать только активных за N дней')
+    plots.set_defaults(func=run_plots)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
-import vk_api
 import pandas as pd
 import time
 import json
 import os
 from datetime import datetime
+from snapshot_store import record_snapshot
+from geo_index import index_members, top_cities, with_labels
+from interactions import EXECUTE_LIMIT, build_execute_code
+from sampling import SAMPLE_PAGE, DEFAULT_CONFIDENCE, sample_size, sample_offsets, sample_estimates, save_sample
 
 TOKEN = 'ТОКЕН'
 VERSION = '5.131'
-os.makedirs('competitors_data', exist_ok=True)
 
 GROUPS = {
     'main': {'name': 'laser33', 'id': -165542199},
@@ -22,6 +24,7 @@ GROUPS = {
 
 class VKDataCollector:
     def __init__(self, token, version):
+        import vk_api
         self.vk_session = vk_api.VkApi(token=token)
         self.vk = self.vk_session.get_api()
         self.version = version
@@ -46,6 +49,31 @@ class VKDataCollector:
             print(f"Ошибка при получении подписчиков: {e}")
             return []
 
+    def get_member_sample(self, group_id, margin, confidence=DEFAULT_CONFIDENCE, fields='sex,bdate,city,country,interests,education,career,last_seen'):
+        try:
+            count = self.vk.groups.getMembers(group_id=group_id, count=0)['count']
+            offsets = sample_offsets(count, sample_size(count, margin, confidence))
+            if offsets is None:
+                return self.get_group_members(group_id, fields), count
+            calls = [('groups.getMembers', {
+                'group_id': group_id,
+                'offset': int(offset),
+                'count': SAMPLE_PAGE,
+                'sort': 'id_asc',
+                'fields': fields
+            }) for offset in offsets]
+            members = []
+            for start in range(0, len(calls), EXECUTE_LIMIT):
+                response = self.vk.execute(code=build_execute_code(calls[start:start + EXECUTE_LIMIT]), v=self.version)
+                for result in response:
+                    members.extend(result.get('items', []) if result else [])
+                time.sleep(0.5)
+            print(f"Выборка: {len(members)} из {count} подписчиков за {-(-len(calls) // EXECUTE_LIMIT) + 1} запросов")
+            return members, count
+        except Exception as e:
+            print(f"Ошибка при получении выборки подписчиков: {e}")
+            return [], 0
+
     def process_user_data(self, user):
         data = {
             'id': user.get('id'),
@@ -53,7 +81,9 @@ class VKDataCollector:
             'last_name': user.get('last_name', ''),
             'sex': user.get('sex'),
             'city': user.get('city', {}).get('title', '') if 'city' in user else '',
-            'country': user.get('country', {}).get('title', '') if 'country' in user else ''
+            'city_id': user.get('city', {}).get('id', 0) if 'city' in user else 0,
+            'country': user.get('country', {}).get('title', '') if 'country' in user else '',
+            'country_id': user.get('country', {}).get('id', 0) if 'country' in user else 0
         }
         if 'bdate' in user:
             bdate = user['bdate'].split('.')
@@ -68,12 +98,18 @@ class VKDataCollector:
         if 'career' in user and user['career']:
             data['position'] = user['career'][0].get('position', '')
         if 'last_seen' in user:
-            data['last_seen'] = datetime.fromtimestamp(user['last_seen']['time']).strftime('%Y-%m-%d %H:%M')
+            data['last_seen'] = user['last_seen']['time']
         data['interests'] = user.get('interests', '')
         return data
 
     def save_group_data(self, group_name, members_data):
+        if not members_data:
+            print(f"Нет данных по {group_name}: сохранённые файлы и снимки не изменены")
+            return
+        os.makedirs('competitors_data', exist_ok=True)
         df = pd.DataFrame(members_data)
+        index_name = GROUPS['main']['name'] if group_name == 'main' else group_name
+        index_members(index_name, df)
         if group_name == 'main':
             filename = 'subscribers.csv'
             df.to_csv(filename, index=False, encoding='utf-8-sig')
@@ -85,13 +121,31 @@ class VKDataCollector:
                 'collected_at': datetime.now().strftime('%Y-%m-%d %H:%M'),
                 'total_members': len(df),
                 'avg_age': df['age'].mean(),
-                'top_cities': df['city'].value_counts().head(3).to_dict()
+                'top_cities': {city: int(count) for city, count in with_labels(top_cities(group_name, 3)).items()}
             }
             with open(f"competitors_data/{group_name}_meta.json", 'w') as f:
                 json.dump(meta, f)
             print(f"Данные по {group_name} сохранены в {filename}")
+        record_snapshot(index_name, df)
+
+    def collect_sample(self, group, margin, confidence=DEFAULT_CONFIDENCE):
+        members, count = self.get_member_sample(abs(group['id']), margin, confidence)
+        if not members:
+            return None
+        df = pd.DataFrame([self.process_user_data(u) for u in members]).drop_duplicates('id')
+        estimates = sample_estimates(df, count, confidence)
+        save_sample(group['name'], df, estimates)
+        age = estimates['age_mean']
+        if age:
+            print(f"Средний возраст {group['name']}: {age['estimate']:.1f} ({age['low']:.1f}–{age['high']:.1f})")
+        return estimates
 
-    def collect_all_data(self):
+    def collect_all_data(self, sample_margin=None, confidence=DEFAULT_CONFIDENCE):
+        if sample_margin:
+            for group in GROUPS['competitors']:
+                print(f"\nВыборка для конкурента {group['name']} (погрешность ±{sample_margin:.0%})")
+                self.collect_sample(group, sample_margin, confidence)
+            return
         print(f"\nСбор данных для основной группы {GROUPS['main']['name']}")
         main_members = self.get_group_members(abs(GROUPS['main']['id']))
         main_data = [self.process_user_data(u) for u in main_members]
@@ -0,0 +1,156 @@
+import pandas as pd
+import numpy as np
+import os
+from post_store import load_all_posts
+
+SIGNATURES_DIR = 'results/minhash'
+SIGNATURES_FILE = f'{SIGNATURES_DIR}/signatures.npy'
+INDEX_FILE = f'{SIGNATURES_DIR}/index.csv'
+DUPLICATES_FILE = 'results/near_duplicates.csv'
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+MIN_WORDS = 5
+THRESHOLD = 0.8
+MAX_BUCKET = 500
+BATCH_SIZE = 500
+SEEDS = np.random.default_rng(33).integers(1, 2**63, NUM_PERM, dtype=np.uint64)
+
+def mix(x):
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def shingles(text):
+    words = str(text).split()
+    if len(words) < MIN_WORDS:
+        return []
+    return [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+def normalize_texts(texts):
+    return (texts.fillna('').astype(str).str.lower()
+            .str.replace(r'https?://\S+|#\w+', ' ', regex=True)
+            .str.replace(r'[^a-zа-яё0-9]+', ' ', regex=True))
+
+def minhash_signatures(texts):
+    shingle_lists = normalize_texts(texts).map(shingles)
+    sizes = shingle_lists.map(len).to_numpy()
+    signatures = np.full((len(texts), NUM_PERM), np.iinfo(np.uint64).max, dtype=np.uint64)
+    has_text = np.flatnonzero(sizes > 0)
+    for start in range(0, len(has_text), BATCH_SIZE):
+        rows = has_text[start:start + BATCH_SIZE]
+        flat = np.concatenate([np.array(shingle_lists.iloc[i], dtype=object) for i in rows])
+        hashes = pd.util.hash_array(flat)
+        offsets = np.concatenate([[0], np.cumsum(sizes[rows])[:-1]])
+        permuted = mix(hashes[:, None] ^ SEEDS[None, :])
+        signatures[rows] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return signatures, sizes > 0
+
+def band_keys(signatures):
+    keys = np.zeros((len(signatures), BANDS), dtype=np.uint64)
+    for band in range(BANDS):
+        key = np.full(len(signatures), np.uint64(band), dtype=np.uint64)
+        for col in signatures[:, band * ROWS:(band + 1) * ROWS].T:
+            key = mix(key ^ col)
+        keys[:, band] = key
+    return keys
+
+def load_store():
+    if not os.path.exists(INDEX_FILE):
+        return pd.DataFrame(columns=['group', 'id', 'has_text']), np.zeros((0, NUM_PERM), dtype=np.uint64)
+    index = pd.read_csv(INDEX_FILE)
+    if 'has_text' not in index.columns:
+        index['has_text'] = True
+    return index, np.load(SIGNATURES_FILE)
+
+def update_signatures(posts=None):
+    posts = load_all_posts() if posts is None else posts
+    index, signatures = load_store()
+    known = pd.MultiIndex.from_frame(index[['group', 'id']])
+    new_posts = posts[~pd.MultiIndex.from_frame(posts[['group', 'id']]).isin(known)]
+    if new_posts.empty:
+        return index, signatures
+    new_signatures, has_text = minhash_signatures(new_posts['text'])
+    index = pd.concat([index, new_posts[['group', 'id']].assign(has_text=has_text)], ignore_index=True)
+    signatures = np.vstack([signatures, new_signatures])
+    os.makedirs(SIGNATURES_DIR, exist_ok=True)
+    index.to_csv(INDEX_FILE, index=False)
+    np.save(SIGNATURES_FILE, signatures)
+    print(f"Добавлено сигнатур: {int(has_text.sum())}, коротких постов пропущено: {int((~has_text).sum())}")
+    return index, signatures
+
+def text_signatures(index, signatures):
+    has_text = index['has_text'].astype(bool).to_numpy()
+    return index[has_text].reset_index(drop=True), signatures[has_text]
+
+def collapse_identical(signatures):
+    _, representatives, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+    return signatures[representatives], inverse.ravel()
+
+def candidate_pairs(signatures):
+    keys = band_keys(signatures)
+    buckets = pd.DataFrame({
+        'band': np.repeat(np.arange(BANDS), len(signatures)),
+        'key': keys.T.ravel(),
+        'row': np.tile(np.arange(len(signatures)), BANDS)
+    })
+    sizes = buckets.groupby(['band', 'key'])['row'].transform('size')
+    small = buckets[(sizes > 1) & (sizes <= MAX_BUCKET)]
+    pairs = small.merge(small, on=['band', 'key'], suffixes=('_a', '_b'))
+    large = buckets[sizes > MAX_BUCKET]
+    anchors = large.groupby(['band', 'key'])['row'].transform('min')
+    star = pd.DataFrame({'row_a': anchors, 'row_b': large['row']})
+    pairs = pd.concat([pairs[['row_a', 'row_b']], star], ignore_index=True)
+    pairs = pairs[pairs['row_a'] < pairs['row_b']]
+    return pairs[['row_a', 'row_b']].drop_duplicates().to_numpy()
+
+def similar_pairs(signatures, threshold=THRESHOLD):
+    pairs = candidate_pairs(signatures)
+    if len(pairs) == 0:
+        return pairs
+    similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    return pairs[similarity >= threshold]
+
+def find_duplicate_clusters(index, signatures, threshold=THRESHOLD):
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+    representatives, inverse = collapse_identical(signatures)
+    pairs = similar_pairs(representatives, threshold).reshape(-1, 2)
+    graph = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(len(representatives), len(representatives))
+    )
+    _, labels = connected_components(graph, directed=False)
+    clusters = index[['group', 'id']].reset_index(drop=True).assign(cluster=labels[inverse])
+    clusters['cluster_size'] = clusters.groupby('cluster')['id'].transform('size')
+    clusters = clusters[clusters['cluster_size'] > 1].copy()
+    clusters['groups'] = clusters.groupby('cluster')['group'].transform('nunique')
+    clusters['cluster'] = clusters.groupby('cluster').ngroup()
+    return clusters.sort_values(['cluster_size', 'cluster'], ascending=[False, True])[
+        ['cluster', 'group', 'id', 'cluster_size', 'groups']
+    ]
+
+def reuse_summary(clusters):
+    per_group = clusters.groupby(['cluster', 'group'])['id'].transform('size')
+    recycled = clusters[per_group > 1]
+    shared = clusters[clusters['groups'] > 1]
+    return pd.DataFrame({
+        'recycled_posts': recycled.groupby('group').size(),
+        'cross_posted': shared.groupby('group').size()
+    }).fillna(0).astype(int)
+
+def main():
+    index, signatures = text_signatures(*update_signatures())
+    if len(index) < 2:
+        print("Недостаточно постов для поиска дубликатов")
+        return
+    clusters = find_duplicate_clusters(index, signatures)
+    clusters.to_csv(DUPLICATES_FILE, index=False, encoding='utf-8-sig')
+    cross = clusters.loc[clusters['groups'] > 1, 'cluster'].nunique()
+    print(f"Найдено групп похожих постов: {clusters['cluster'].nunique()} (между сообществами: {cross})")
+    if not clusters.empty:
+        print(reuse_summary(clusters))
+
+if __name__ == "__main__":
+    main()
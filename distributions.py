@@ -0,0 +1,60 @@
+import pandas as pd
+import numpy as np
+import os
+
+AGE_MIN = 14
+AGE_MAX = 80
+AGE_GRID = np.arange(AGE_MIN, AGE_MAX + 1)
+HISTOGRAMS_FILE = 'results/age_histograms.csv'
+
+def age_histogram(ages):
+    ages = pd.to_numeric(pd.Series(ages), errors='coerce').dropna().to_numpy(dtype=np.int64)
+    ages = ages[(ages >= AGE_MIN) & (ages <= AGE_MAX)]
+    return np.bincount(ages - AGE_MIN, minlength=len(AGE_GRID))
+
+def scott_bandwidth(counts):
+    n = counts.sum()
+    if n < 2:
+        return 1.0
+    mean = (AGE_GRID * counts).sum() / n
+    std = np.sqrt(((AGE_GRID - mean) ** 2 * counts).sum() / (n - 1))
+    return max(std * n ** (-1 / 5), 1.0)
+
+def fft_convolve(signal, kernel):
+    size = len(signal) + len(kernel) - 1
+    full = np.fft.irfft(np.fft.rfft(signal, size) * np.fft.rfft(kernel, size), size)
+    start = (len(kernel) - 1) // 2
+    return full[start:start + len(signal)]
+
+def kde_from_histogram(counts, bandwidth=None):
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum()
+    if n == 0:
+        return np.zeros_like(counts)
+    bandwidth = bandwidth or scott_bandwidth(counts)
+    half = int(np.ceil(4 * bandwidth))
+    offsets = np.arange(-half, half + 1)
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    return np.clip(fft_convolve(counts, kernel), 0, None) / n
+
+def load_age_histograms():
+    if not os.path.exists(HISTOGRAMS_FILE):
+        return pd.DataFrame(columns=AGE_GRID, dtype='int64')
+    histograms = pd.read_csv(HISTOGRAMS_FILE, index_col='group')
+    histograms.columns = histograms.columns.astype(int)
+    return histograms
+
+def save_age_histogram(group, counts):
+    os.makedirs('results', exist_ok=True)
+    histograms = load_age_histograms()
+    histograms.loc[group] = counts
+    histograms.index.name = 'group'
+    histograms.astype('int64').to_csv(HISTOGRAMS_FILE)
+    return histograms
+
+def kde_curves(histograms, bandwidth=None):
+    return pd.DataFrame(
+        {group: kde_from_histogram(row.to_numpy(), bandwidth) for group, row in histograms.iterrows()},
+        index=AGE_GRID
+    )
@@ -0,0 +1,153 @@
+import pandas as pd
+import numpy as np
+import os
+from activity_index import INACTIVE_BUCKET, add_activity_bucket, bucket_for
+from subscriber_schema import apply_subscriber_schema
+
+GEO_DIR = 'results/geo'
+MATRIX_FILE = f'{GEO_DIR}/city_counts.npz'
+CITIES_FILE = f'{GEO_DIR}/cities.csv'
+GROUPS_FILE = f'{GEO_DIR}/groups.csv'
+MARKET_SHARE_FILE = 'results/market_share.csv'
+UNKNOWN_CITY = 0
+BUCKETS = INACTIVE_BUCKET + 1
+CITY_COLUMNS = ['city_id', 'city', 'country_id', 'country']
+
+def load_geo_index():
+    from scipy import sparse
+    if not os.path.exists(MATRIX_FILE):
+        return sparse.csr_matrix((0, 0), dtype=np.int64), pd.DataFrame(columns=CITY_COLUMNS), []
+    cities = pd.read_csv(CITIES_FILE, keep_default_na=False, na_values=[''])
+    groups = pd.read_csv(GROUPS_FILE)['group'].tolist()
+    return sparse.load_npz(MATRIX_FILE).tocsr(), cities, groups
+
+def save_geo_index(matrix, cities, groups):
+    from scipy import sparse
+    os.makedirs(GEO_DIR, exist_ok=True)
+    sparse.save_npz(MATRIX_FILE, matrix.tocsr())
+    cities.to_csv(CITIES_FILE, index=False)
+    pd.DataFrame({'group': groups}).to_csv(GROUPS_FILE, index=False)
+
+def column_ids(df, column, cities):
+    if f'{column}_id' in df.columns:
+        return pd.to_numeric(df[f'{column}_id'], errors='coerce').fillna(UNKNOWN_CITY).astype(np.int64)
+    if column not in df.columns:
+        return pd.Series(UNKNOWN_CITY, index=df.index, dtype=np.int64)
+    titles = df[column].astype(object)
+    known = cities.dropna(subset=[column]).drop_duplicates(column).set_index(column)[f'{column}_id']
+    ids = titles.map(known)
+    missing = titles[ids.isna() & titles.notna() & (titles != '')].unique()
+    start = min(int(known.min()) if len(known) else 0, 0) - 1
+    ids = ids.fillna(titles.map(dict(zip(missing, range(start, start - len(missing), -1)))))
+    return ids.fillna(UNKNOWN_CITY).astype(np.int64)
+
+def update_cities(cities, df, city_ids, country_ids):
+    found = pd.DataFrame({
+        'city_id': city_ids.to_numpy(),
+        'city': df['city'].astype(object).to_numpy() if 'city' in df.columns else None,
+        'country_id': country_ids.to_numpy(),
+        'country': df['country'].astype(object).to_numpy() if 'country' in df.columns else None
+    })
+    found = found[found['city_id'] != UNKNOWN_CITY].drop_duplicates('city_id')
+    new = found[~found['city_id'].isin(cities['city_id'])]
+    return pd.concat([cities, new], ignore_index=True) if len(new) else cities
+
+def update_geo_index(group, df):
+    from scipy import sparse
+    matrix, cities, groups = load_geo_index()
+    city_ids = column_ids(df, 'city', cities)
+    country_ids = column_ids(df, 'country', cities)
+    cities = update_cities(cities, df, city_ids, country_ids)
+    rows = pd.Index(cities['city_id']).get_indexer(city_ids[city_ids != UNKNOWN_CITY])
+    if group not in groups:
+        groups.append(group)
+    g = groups.index(group)
+    buckets = df['activity_bucket'].to_numpy()[city_ids.to_numpy() != UNKNOWN_CITY] if 'activity_bucket' in df.columns else INACTIVE_BUCKET
+    cols = g * BUCKETS + buckets + np.zeros(len(rows), dtype=np.int64)
+    updated = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+        shape=(len(cities), len(groups) * BUCKETS)
+    )
+    old = matrix.tocoo()
+    keep = old.col // BUCKETS != g
+    previous = sparse.csr_matrix(
+        (old.data[keep], (old.row[keep], old.col[keep])),
+        shape=(len(cities), len(groups) * BUCKETS)
+    )
+    save_geo_index(previous + updated, cities, groups)
+
+def index_members(group, df):
+    if 'first_name' in df.columns:
+        df = df[df['first_name'] != 'DELETED']
+    update_geo_index(group, add_activity_bucket(apply_subscriber_schema(df.copy())))
+
+def city_counts(active_days=None, level='city'):
+    from scipy import sparse
+    matrix, cities, groups = load_geo_index()
+    if not groups:
+        return pd.DataFrame()
+    last = INACTIVE_BUCKET if active_days is None else bucket_for(active_days)
+    cols = np.arange(len(groups) * BUCKETS)
+    keep = cols % BUCKETS <= last
+    selector = sparse.csr_matrix(
+        (np.ones(keep.sum(), dtype=np.int64), (cols[keep], cols[keep] // BUCKETS)),
+        shape=(len(cols), len(groups))
+    )
+    counts = matrix @ selector
+    if level == 'country':
+        regions, region_idx = np.unique(cities['country_id'].fillna(UNKNOWN_CITY).to_numpy(dtype=np.int64), return_inverse=True)
+        grouping = sparse.csr_matrix(
+            (np.ones(len(cities), dtype=np.int64), (region_idx, np.arange(len(cities)))),
+            shape=(len(regions), len(cities))
+        )
+        return pd.DataFrame((grouping @ counts).toarray(), index=pd.Index(regions, name='country_id'), columns=groups)
+    return pd.DataFrame(counts.toarray(), index=pd.Index(cities['city_id'], name='city_id'), columns=groups)
+
+def region_labels(level='city'):
+    _, cities, _ = load_geo_index()
+    table = cities.drop_duplicates(f'{level}_id').set_index(f'{level}_id')
+    labels = table[level].astype(object).where(table[level].notna(), table.index.astype(str))
+    if level == 'city':
+        duplicated = labels.duplicated(keep=False)
+        labels[duplicated] = labels[duplicated] + ' (' + table.loc[duplicated, 'country'].fillna('').astype(str) + ')'
+        duplicated = labels.duplicated(keep=False)
+        labels[duplicated] = labels[duplicated] + ' #' + labels.index[duplicated].astype(str)
+    return labels
+
+def with_labels(data, level='city'):
+    labels = region_labels(level)
+    return data.rename(index=lambda region: labels.get(region, str(region))).rename_axis(level)
+
+def top_cities(group, n=10, active_days=None):
+    counts = city_counts(active_days)
+    if group not in counts.columns:
+        return pd.Series(dtype='int64')
+    top = counts[group].nlargest(n)
+    return top[top > 0]
+
+def city_comparison(group, n=5, active_days=None):
+    counts = city_counts(active_days)
+    if group not in counts.columns:
+        return pd.DataFrame()
+    return counts.loc[top_cities(group, n, active_days).index]
+
+def market_share(active_days=None, level='city', min_audience=10):
+    counts = city_counts(active_days, level)
+    if counts.empty:
+        return counts
+    totals = counts.sum(axis=1)
+    counts = counts[totals >= min_audience]
+    return (counts.div(counts.sum(axis=1), axis=0) * 100).round(2)
+
+def main():
+    share = market_share()
+    if share.empty:
+        print("Геоиндекс пуст")
+        return
+    share = with_labels(share)
+    share.to_csv(MARKET_SHARE_FILE, encoding='utf-8-sig')
+    print(f"Доли рынка по {len(share)} городам сохранены в {MARKET_SHARE_FILE}")
+    print(share.head(10))
+
+if __name__ == "__main__":
+    main()
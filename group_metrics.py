@@ -0,0 +1,80 @@
+import pandas as pd
+import json
+import os
+import time
+from post_store import MAIN_GROUP, load_all_posts
+
+VERSION = '5.131'
+MAIN_GROUP_ID = -165542199
+GROUP_SIZES_FILE = 'results/group_sizes.json'
+GROUP_METRICS_FILE = 'results/group_metrics.csv'
+CACHE_TTL = 6 * 3600
+
+def fetch_group_sizes(vk_session, group_ids):
+    response = vk_session.method('groups.getById', {
+        'group_ids': ','.join(str(abs(g)) if isinstance(g, int) else g for g in group_ids),
+        'fields': 'members_count',
+        'v': VERSION
+    })
+    groups = response['groups'] if isinstance(response, dict) else response
+    sizes = {}
+    for group in groups:
+        key = MAIN_GROUP if -group['id'] == MAIN_GROUP_ID else group.get('screen_name', f"club{group['id']}")
+        sizes[key] = {
+            'id': -group['id'],
+            'name': group.get('name', key),
+            'members_count': group.get('members_count', 0)
+        }
+    return sizes
+
+def covers(sizes, group_ids):
+    cached_ids = {group['id'] for group in sizes.values()}
+    return all(-abs(g) in cached_ids if isinstance(g, int) else g in sizes for g in group_ids)
+
+def save_group_sizes(sizes):
+    os.makedirs('results', exist_ok=True)
+    with open(GROUP_SIZES_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'fetched_at': time.time(), 'groups': sizes}, f, ensure_ascii=False, indent=2)
+
+def load_group_sizes(vk_session=None, group_ids=None, max_age=CACHE_TTL):
+    cached = None
+    if os.path.exists(GROUP_SIZES_FILE):
+        with open(GROUP_SIZES_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    fresh = cached is not None and time.time() - cached['fetched_at'] < max_age
+    fresh = fresh and covers(cached['groups'], group_ids or [])
+    if vk_session is not None and group_ids and not fresh:
+        try:
+            sizes = {**(cached['groups'] if cached else {}), **fetch_group_sizes(vk_session, group_ids)}
+            save_group_sizes(sizes)
+            return sizes
+        except Exception as e:
+            print(f"Ошибка при получении размеров сообществ: {e}")
+    return cached['groups'] if cached else {}
+
+def compute_group_metrics(posts, sizes):
+    members = pd.Series({key: group['members_count'] for key, group in sizes.items()}, dtype='float64')
+    posts = posts.assign(subscribers=posts['group'].map(members))
+    posts = posts[posts['subscribers'] > 0]
+    posts = posts.assign(er=(posts['likes'] + posts['reposts']) / posts['subscribers'] * 100)
+    metrics = posts.groupby('group').agg(
+        subscribers=('subscribers', 'first'),
+        posts=('id', 'size'),
+        avg_likes=('likes', 'mean'),
+        avg_reposts=('reposts', 'mean'),
+        er=('er', 'mean'),
+        er_median=('er', 'median')
+    )
+    metrics['name'] = [sizes[key]['name'] for key in metrics.index]
+    return metrics
+
+def refresh_group_metrics(sizes):
+    metrics = compute_group_metrics(load_all_posts(), sizes)
+    os.makedirs('results', exist_ok=True)
+    metrics.to_csv(GROUP_METRICS_FILE, encoding='utf-8-sig')
+    return metrics
+
+def load_group_metrics():
+    if not os.path.exists(GROUP_METRICS_FILE):
+        return None
+    return pd.read_csv(GROUP_METRICS_FILE, index_col='group', encoding='utf-8-sig')
@@ -0,0 +1,234 @@
+import pandas as pd
+import json
+import os
+import time
+from collections import deque
+from post_store import MAIN_GROUP, load_all_posts
+
+TOKEN = 'ТОКЕН'
+VERSION = '5.131'
+GROUP_ID = -165542199
+INTERACTIONS_FILE = 'results/interactions.csv'
+COMMENTS_FILE = 'results/comments.csv'
+STATE_FILE = 'results/interactions_state.json'
+EXECUTE_LIMIT = 25
+PAGE_SIZES = {'like': 1000, 'comment': 100}
+THREAD_ITEMS = 10
+RETRIES = 3
+INTERACTION_COLUMNS = ['group', 'post_id', 'user_id', 'type']
+COMMENT_COLUMNS = ['group', 'post_id', 'comment_id', 'reply_to', 'user_id', 'date', 'text']
+
+def owner_ids():
+    from analyze_competitors_content import COMPETITORS
+    owners = {c['screen_name']: c['id'] for c in COMPETITORS}
+    owners[MAIN_GROUP] = GROUP_ID
+    return owners
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        for path in [INTERACTIONS_FILE, COMMENTS_FILE]:
+            if os.path.exists(path):
+                os.replace(path, f'{path}.bak')
+        return {}
+    with open(STATE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state):
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+def build_call(task):
+    if task['kind'] == 'like':
+        return 'likes.getList', {
+            'type': 'post',
+            'owner_id': task['owner_id'],
+            'item_id': task['post_id'],
+            'count': min(PAGE_SIZES['like'], task['need'] - task['offset']),
+            'offset': task['offset']
+        }
+    params = {
+        'owner_id': task['owner_id'],
+        'post_id': task['post_id'],
+        'count': PAGE_SIZES['comment'],
+        'offset': task['offset'],
+        'sort': 'desc'
+    }
+    if task['kind'] == 'thread':
+        params['comment_id'] = task['comment_id']
+    else:
+        params['thread_items_count'] = THREAD_ITEMS
+    return 'wall.getComments', params
+
+def build_execute_code(calls):
+    requests = [f'API.{method}({json.dumps(params, ensure_ascii=False)})' for method, params in calls]
+    return 'return [' + ','.join(requests) + '];'
+
+def pending_tasks(posts, state, owners):
+    tasks = []
+    for post in posts.itertuples(index=False):
+        owner_id = owners.get(post.group)
+        if owner_id is None:
+            continue
+        seen = state.get(post.group, {}).get(str(post.id), {})
+        if post.comments > seen.get('comments', 0):
+            tasks.append({'group': post.group, 'owner_id': owner_id, 'post_id': int(post.id), 'kind': 'comment',
+                          'offset': 0, 'after': seen.get('last_comment_id', 0), 'total': int(post.comments)})
+        new_likes = post.likes - seen.get('likes', 0)
+        if new_likes > 0:
+            tasks.append({'group': post.group, 'owner_id': owner_id, 'post_id': int(post.id), 'kind': 'like',
+                          'offset': 0, 'need': int(new_likes), 'total': int(post.likes)})
+    return tasks
+
+def append_rows(path, rows, columns):
+    if not rows:
+        return
+    pd.DataFrame(rows, columns=columns).to_csv(path, mode='a', header=not os.path.exists(path), index=False, encoding='utf-8')
+
+def record_comment(task, comment, reply_to, comments, progress):
+    progress['newest'] = max(progress['newest'], comment['id'])
+    comments.append([task['group'], task['post_id'], comment['id'], reply_to, comment.get('from_id'), comment.get('date'), comment.get('text', '')])
+
+def close_comments(seen):
+    progress = seen['progress']
+    if progress['done'] and progress['pending'] == 0:
+        if not progress.get('failed'):
+            seen['last_comment_id'] = progress['newest']
+            seen['comments'] = progress['total']
+        del seen['progress']
+
+def retry_task(task, queue, state):
+    attempts = task.get('attempts', 0) + 1
+    if attempts < RETRIES:
+        queue.append(dict(task, attempts=attempts))
+        return
+    print(f"Пост {task['group']}/{task['post_id']}: запрос {task['kind']} не выполнен после {RETRIES} попыток")
+    seen = state.get(task['group'], {}).get(str(task['post_id']), {})
+    if task['kind'] == 'like' or 'progress' not in seen:
+        return
+    progress = seen['progress']
+    progress['failed'] = True
+    if task['kind'] == 'thread':
+        progress['pending'] -= 1
+    else:
+        progress['done'] = True
+    close_comments(seen)
+
+def handle_likes(task, result, interactions, seen):
+    users = result.get('items', [])
+    interactions.extend([[task['group'], task['post_id'], user_id, 'like'] for user_id in users])
+    next_offset = task['offset'] + len(users)
+    if users and next_offset < min(task['need'], result.get('count', 0)):
+        return [dict(task, offset=next_offset)]
+    seen['likes'] = task['total']
+    return []
+
+def handle_thread(task, result, comments, seen):
+    progress = seen['progress']
+    items = result.get('items', [])
+    for reply in items:
+        if reply['id'] > task['after']:
+            record_comment(task, reply, task['comment_id'], comments, progress)
+    next_offset = task['offset'] + len(items)
+    if items and all(r['id'] > task['after'] for r in items) and next_offset < result.get('count', 0):
+        return [dict(task, offset=next_offset)]
+    progress['pending'] -= 1
+    close_comments(seen)
+    return []
+
+def handle_comments(task, result, comments, seen):
+    if task['offset'] == 0:
+        seen['progress'] = {'newest': task['after'], 'pending': 0, 'done': False, 'total': task['total']}
+    progress = seen['progress']
+    items = result.get('items', [])
+    tasks = []
+    for comment in items:
+        if comment['id'] > task['after']:
+            record_comment(task, comment, None, comments, progress)
+        thread = comment.get('thread', {})
+        replies = thread.get('items', [])
+        if thread.get('count', 0) > len(replies):
+            tasks.append(dict(task, kind='thread', offset=0, comment_id=comment['id']))
+            continue
+        for reply in replies:
+            if reply['id'] > task['after']:
+                record_comment(task, reply, comment['id'], comments, progress)
+    progress['pending'] += len(tasks)
+    next_offset = task['offset'] + len(items)
+    if items and next_offset < result.get('current_level_count', result.get('count', 0)):
+        tasks.append(dict(task, offset=next_offset))
+    else:
+        progress['done'] = True
+        close_comments(seen)
+    return tasks
+
+def handle_result(task, result, interactions, comments, state):
+    seen = state.setdefault(task['group'], {}).setdefault(str(task['post_id']), {})
+    if task['kind'] == 'like':
+        return handle_likes(task, result, interactions, seen)
+    if task['kind'] == 'thread':
+        return handle_thread(task, result, comments, seen)
+    return handle_comments(task, result, comments, seen)
+
+def harvest(vk, posts, state=None, owners=None):
+    state = load_state() if state is None else state
+    owners = owner_ids() if owners is None else owners
+    queue = deque(pending_tasks(posts, state, owners))
+    print(f"Постов с новыми взаимодействиями: {len(queue)}")
+    total = 0
+    while queue:
+        batch = [queue.popleft() for _ in range(min(EXECUTE_LIMIT, len(queue)))]
+        try:
+            response = vk.execute(code=build_execute_code([build_call(task) for task in batch]), v=VERSION)
+        except Exception as e:
+            print(f"Ошибка execute-запроса: {e}")
+            for task in batch:
+                retry_task(task, queue, state)
+            save_state(state)
+            time.sleep(2)
+            continue
+        interactions, comments = [], []
+        for task, result in zip(batch, response):
+            if not result:
+                retry_task(task, queue, state)
+                continue
+            queue.extend(handle_result(task, result, interactions, comments, state))
+        append_rows(INTERACTIONS_FILE, interactions, INTERACTION_COLUMNS)
+        append_rows(COMMENTS_FILE, comments, COMMENT_COLUMNS)
+        save_state(state)
+        total += len(interactions) + len(comments)
+        print(f"Собрано {total} взаимодействий, осталось запросов: {len(queue)}")
+        time.sleep(0.4)
+    return total
+
+def load_comments(group=MAIN_GROUP):
+    if not os.path.exists(COMMENTS_FILE):
+        return None
+    comments = pd.read_csv(COMMENTS_FILE)
+    comments = comments[comments['group'] == group]
+    return comments.drop_duplicates(['group', 'post_id', 'comment_id'], keep='last')
+
+def load_interactions(group=MAIN_GROUP):
+    frames = []
+    if os.path.exists(INTERACTIONS_FILE):
+        likes = pd.read_csv(INTERACTIONS_FILE)
+        likes = likes[(likes['group'] == group) & (likes['type'] == 'like')]
+        frames.append(likes.drop_duplicates(INTERACTION_COLUMNS))
+    comments = load_comments(group)
+    if comments is not None:
+        comments = comments[comments['user_id'] > 0]
+        frames.append(comments[['group', 'post_id', 'user_id']].assign(type='comment'))
+    if not frames:
+        return None
+    interactions = pd.concat(frames, ignore_index=True)
+    interactions['user_id'] = interactions['user_id'].astype('int64')
+    return interactions.astype({'group': 'category', 'type': 'category'})
+
+def main():
+    import vk_api
+    os.makedirs('results', exist_ok=True)
+    vk = vk_api.VkApi(token=TOKEN).get_api()
+    total = harvest(vk, load_all_posts())
+    print(f"Добавлено {total} взаимодействий в {INTERACTIONS_FILE} и {COMMENTS_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+from post_store import MAIN_GROUP
+
+TOKEN_PATTERN = r'\b[а-яa-zё]{3,}\b'
+LEMMA_CACHE_FILE = 'results/lemma_cache.json'
+CHUNKS_DIR = 'results/interests_chunks'
+SEGMENTS_FILE = 'results/interest_segments.csv'
+SHARES_FILE = 'results/interest_segment_shares.csv'
+FREQUENCIES_DIR = 'results/interest_frequencies'
+CHUNK_SIZE = 50_000
+N_SEGMENTS = 8
+MIN_DF = 5
+MAX_DF_RATIO = 0.5
+MAX_FEATURES = 20_000
+TOP_TERMS = 10
+STOP_LEMMAS = {'и', 'в', 'на', 'для', 'все', 'всё', 'это', 'как', 'что', 'так', 'или', 'the', 'and'}
+RU_ENDINGS = sorted([
+    'ами', 'ями', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ая', 'яя', 'ое', 'ее', 'ой', 'ей',
+    'ый', 'ий', 'ые', 'ие', 'ых', 'их', 'ом', 'ем', 'ам', 'ям', 'ах', 'ях', 'ов', 'ев', 'ию',
+    'ия', 'ие', 'ии', 'ью', 'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь'
+], key=len, reverse=True)
+
+def subscriber_files():
+    files = {}
+    if os.path.exists('subscribers_cleaned.csv'):
+        files[MAIN_GROUP] = 'subscribers_cleaned.csv'
+    if os.path.exists('competitors_clean'):
+        for file in sorted(os.listdir('competitors_clean')):
+            if file.endswith('_clean.csv'):
+                files[file.replace('_clean.csv', '')] = f'competitors_clean/{file}'
+    return files
+
+def strip_ending(word):
+    for ending in RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= 3:
+            return word[:-len(ending)]
+    return word
+
+def load_morph():
+    for module in ('pymorphy3', 'pymorphy2'):
+        try:
+            morph = __import__(module).MorphAnalyzer()
+            return lambda word: morph.parse(word)[0].normal_form
+        except ImportError:
+            continue
+    return strip_ending
+
+class Lemmatizer:
+    def __init__(self, cache_file=LEMMA_CACHE_FILE):
+        self.cache_file = cache_file
+        self.cache = {}
+        self.morph = None
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+
+    def lemmatize(self, tokens):
+        missing = [word for word in pd.unique(tokens) if word not in self.cache]
+        if missing:
+            self.morph = self.morph or load_morph()
+            self.cache.update({word: self.morph(word) for word in missing})
+        return tokens.map(self.cache)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False)
+
+def read_interests(path, chunksize=CHUNK_SIZE):
+    for chunk in pd.read_csv(path, usecols=['interests'], chunksize=chunksize):
+        yield chunk['interests'].fillna('').astype(str)
+
+def chunk_lemmas(interests, lemmatizer):
+    tokens = interests.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    lemmas = lemmatizer.lemmatize(tokens)
+    return lemmas[~lemmas.isin(STOP_LEMMAS)]
+
+def lemma_counts(path, lemmatizer=None):
+    lemmatizer = lemmatizer or Lemmatizer()
+    counts = pd.Series(dtype='int64')
+    for interests in read_interests(path):
+        counts = counts.add(chunk_lemmas(interests, lemmatizer).value_counts(), fill_value=0)
+    lemmatizer.save()
+    return counts.astype('int64').sort_values(ascending=False)
+
+def load_frequencies(group, path, lemmatizer=None):
+    cached = f'{FREQUENCIES_DIR}/{group}.csv'
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+        return pd.read_csv(cached, index_col='lemma', keep_default_na=False)['count']
+    counts = lemma_counts(path, lemmatizer)
+    os.makedirs(FREQUENCIES_DIR, exist_ok=True)
+    counts.rename_axis('lemma').rename('count').to_csv(cached)
+    return counts
+
+def all_frequencies(files=None):
+    lemmatizer = Lemmatizer()
+    files = files or subscriber_files()
+    return {group: load_frequencies(group, path, lemmatizer) for group, path in files.items()}
+
+def build_chunk_matrices(files, lemmatizer):
+    from scipy import sparse
+    shutil.rmtree(CHUNKS_DIR, ignore_errors=True)
+    os.makedirs(CHUNKS_DIR)
+    vocabulary = {}
+    chunks = []
+    for group, path in files.items():
+        for i, interests in enumerate(read_interests(path)):
+            lemmas = chunk_lemmas(interests, lemmatizer)
+            for lemma in pd.unique(lemmas):
+                vocabulary.setdefault(lemma, len(vocabulary))
+            rows = interests.index.get_indexer(lemmas.index)
+            cols = lemmas.map(vocabulary).to_numpy(dtype=np.int64)
+            matrix = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                shape=(len(interests), len(vocabulary))
+            )
+            matrix.sum_duplicates()
+            chunk_file = f'{CHUNKS_DIR}/{group}_{i}.npz'
+            sparse.save_npz(chunk_file, matrix)
+            chunks.append((group, chunk_file))
+    lemmatizer.save()
+    return chunks, vocabulary
+
+def load_chunk(chunk_file, n_terms):
+    from scipy import sparse
+    matrix = sparse.load_npz(chunk_file).tocsr()
+    matrix.resize((matrix.shape[0], n_terms))
+    return matrix
+
+def select_features(chunks, vocabulary):
+    n_terms = len(vocabulary)
+    df = np.zeros(n_terms, dtype=np.int64)
+    n_docs = 0
+    for _, chunk_file in chunks:
+        matrix = load_chunk(chunk_file, n_terms)
+        df += np.bincount(matrix.indices, minlength=n_terms)
+        n_docs += int((matrix.getnnz(axis=1) > 0).sum())
+    keep = np.flatnonzero((df >= MIN_DF) & (df <= MAX_DF_RATIO * max(n_docs, 1)))
+    keep = keep[np.argsort(-df[keep], kind='stable')[:MAX_FEATURES]]
+    idf = np.log((1 + n_docs) / (1 + df[keep])) + 1
+    terms = np.array(list(vocabulary), dtype=object)[keep]
+    return keep, idf.astype(np.float32), terms
+
+def tfidf_chunks(chunks, n_terms, keep, idf):
+    from sklearn.preprocessing import normalize
+    for group, chunk_file in chunks:
+        matrix = load_chunk(chunk_file, n_terms)[:, keep].multiply(idf).tocsr()
+        matrix = matrix[matrix.getnnz(axis=1) > 0]
+        yield group, normalize(matrix)
+
+def cluster_interests(files=None, n_segments=N_SEGMENTS):
+    from sklearn.cluster import MiniBatchKMeans
+    files = files or subscriber_files()
+    chunks, vocabulary = build_chunk_matrices(files, Lemmatizer())
+    keep, idf, terms = select_features(chunks, vocabulary)
+    if len(keep) < n_segments:
+        print("Недостаточно интересов для кластеризации")
+        return None, None
+
+    model = MiniBatchKMeans(n_clusters=n_segments, random_state=42, batch_size=4096, n_init=3)
+    for _, matrix in tfidf_chunks(chunks, len(vocabulary), keep, idf):
+        if matrix.shape[0] >= n_segments:
+            model.partial_fit(matrix)
+    if not hasattr(model, 'cluster_centers_'):
+        print("Недостаточно профилей для кластеризации")
+        return None, None
+
+    counts = {}
+    for group, matrix in tfidf_chunks(chunks, len(vocabulary), keep, idf):
+        if matrix.shape[0]:
+            labels = np.bincount(model.predict(matrix), minlength=n_segments)
+            counts[group] = counts.get(group, 0) + labels
+
+    top = np.argsort(-model.cluster_centers_, axis=1)[:, :TOP_TERMS]
+    segments = pd.DataFrame({
+        'segment': range(n_segments),
+        'top_terms': [', '.join(terms[row]) for row in top]
+    }).set_index('segment')
+    shares = pd.DataFrame(counts).T
+    shares = shares.div(shares.sum(axis=1), axis=0).round(4)
+    shares.columns.name = 'segment'
+    shutil.rmtree(CHUNKS_DIR, ignore_errors=True)
+    return segments, shares
+
+def main(n_segments=N_SEGMENTS):
+    segments, shares = cluster_interests(n_segments=n_segments)
+    if segments is None:
+        return
+    segments.to_csv(SEGMENTS_FILE, encoding='utf-8-sig')
+    shares.to_csv(SHARES_FILE, encoding='utf-8-sig')
+    print("\nСегменты интересов:")
+    for segment, row in segments.iterrows():
+        print(f"{segment}: {row['top_terms']}")
+    print("\nДоли сегментов по сообществам:")
+    print(shares)
+
+if __name__ == "__main__":
+    main()
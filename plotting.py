@@ -0,0 +1,14 @@
+import os
+
+_styled = False
+
+def load_plotting(output_dir='graphs', style=True):
+    global _styled
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    if style and not _styled:
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
+        _styled = True
+    os.makedirs(output_dir, exist_ok=True)
+    return plt, sns
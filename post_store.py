@@ -0,0 +1,47 @@
+import pandas as pd
+import os
+
+MAIN_GROUP = 'laser33'
+MAIN_POSTS_FILE = 'results/posts_stats.csv'
+COMPETITORS_DIR = 'competitors_data'
+METRICS = ['likes', 'reposts', 'comments', 'views']
+
+def posts_files():
+    files = {}
+    if os.path.exists(MAIN_POSTS_FILE):
+        files[MAIN_GROUP] = MAIN_POSTS_FILE
+    if os.path.exists(COMPETITORS_DIR):
+        for file in sorted(os.listdir(COMPETITORS_DIR)):
+            if file.endswith('_content.csv'):
+                files[file.replace('_content.csv', '')] = f'{COMPETITORS_DIR}/{file}'
+    return files
+
+def normalize_posts(df):
+    df = df.rename(columns={'post_id': 'id'}).copy()
+    df['date'] = pd.to_datetime(df['date'])
+    for col in METRICS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int64')
+        else:
+            df[col] = 0
+    df['engagement'] = df['likes'] + df['reposts']*2
+    return df
+
+def load_posts(group):
+    path = posts_files().get(group)
+    if path is None:
+        return None
+    return normalize_posts(pd.read_csv(path))
+
+def load_all_posts():
+    frames = []
+    for group, path in posts_files().items():
+        try:
+            df = normalize_posts(pd.read_csv(path))
+            df['group'] = group
+            frames.append(df)
+        except Exception as e:
+            print(f"Ошибка загрузки постов {group}: {e}")
+    if not frames:
+        return pd.DataFrame(columns=['id', 'date', 'group', 'engagement'] + METRICS)
+    return pd.concat(frames, ignore_index=True)
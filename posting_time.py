@@ -0,0 +1,77 @@
+import pandas as pd
+import os
+from post_store import posts_files, load_all_posts
+
+POSTING_MODEL_FILE = 'results/posting_time_model.csv'
+WEEKDAYS = ['Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс']
+PRIOR_WEIGHT = 5
+
+def engagement_rate(posts):
+    by_views = posts['views'] > 0
+    rate = (posts['engagement'] / posts['views'].where(by_views)).fillna(posts['engagement'].astype('float64'))
+    source = pd.Series('views', index=posts.index).where(by_views, 'engagement')
+    return rate, source
+
+def build_posting_model(posts):
+    rate, source = engagement_rate(posts)
+    posts = posts.assign(rate=rate, source=source)
+    group_mean = posts.groupby(['group', 'source'])['rate'].transform('mean')
+    posts = posts.assign(lift=posts['rate'] / group_mean.where(group_mean > 0)).dropna(subset=['lift'])
+    if posts.empty:
+        return None
+    cells = pd.MultiIndex.from_product([range(7), range(24)], names=['weekday', 'hour'])
+    model = posts.groupby([posts['date'].dt.weekday.rename('weekday'), posts['date'].dt.hour.rename('hour')]).agg(
+        posts=('lift', 'size'),
+        lift_sum=('lift', 'sum')
+    ).reindex(cells, fill_value=0)
+    model['score'] = smoothed_score(model)
+    return model
+
+def smoothed_score(cells):
+    return (cells['lift_sum'] + PRIOR_WEIGHT) / (cells['posts'] + PRIOR_WEIGHT)
+
+def model_is_stale():
+    if not os.path.exists(POSTING_MODEL_FILE):
+        return True
+    built_at = os.path.getmtime(POSTING_MODEL_FILE)
+    return any(os.path.getmtime(path) > built_at for path in posts_files().values())
+
+def refresh_posting_model():
+    posts = load_all_posts()
+    if posts.empty:
+        return None
+    model = build_posting_model(posts)
+    if model is None:
+        return None
+    os.makedirs('results', exist_ok=True)
+    model.to_csv(POSTING_MODEL_FILE)
+    return model
+
+def load_posting_model():
+    if model_is_stale():
+        return refresh_posting_model()
+    return pd.read_csv(POSTING_MODEL_FILE, index_col=['weekday', 'hour'])
+
+def best_slots(model, n=3):
+    return model['score'].nlargest(n).index.tolist()
+
+def best_hours(model, n=3):
+    return smoothed_score(model.groupby(level='hour').sum()).nlargest(n).index.tolist()
+
+def best_days(model, n=3):
+    days = smoothed_score(model.groupby(level='weekday').sum()).nlargest(n).index
+    return [WEEKDAYS[day] for day in sorted(days)]
+
+def score_matrix(model):
+    matrix = model['score'].unstack('hour')
+    matrix.index = [WEEKDAYS[day] for day in matrix.index]
+    return matrix
+
+if __name__ == "__main__":
+    model = refresh_posting_model()
+    if model is None:
+        print("Нет постов для построения модели времени публикаций")
+    else:
+        print(score_matrix(model).round(2))
+        print(f"\nЛучшие часы: {best_hours(model)}")
+        print(f"Лучшие дни: {best_days(model)}")
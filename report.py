@@ -0,0 +1,245 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import time
+from datetime import datetime
+from post_store import MAIN_GROUP
+from timeseries import ROLLUPS_DIR, load_rollup
+from distributions import load_age_histograms, kde_curves
+from activity_index import load_activity_index
+from group_metrics import load_group_metrics
+from posting_time import POSTING_MODEL_FILE, WEEKDAYS
+from audience_overlap import load_reach
+from snapshot_store import growth_summary
+
+REPORT_DIR = 'report'
+SUMMARY_FILE = 'competitors_clean/summary_stats.csv'
+FEATURES_FILE = 'results/group_features.csv'
+SEGMENT_SHARES_FILE = 'results/interest_segment_shares.csv'
+STRATEGY_FILE = 'results/strategy.json'
+
+def frame_payload(df):
+    if df is None or df.empty:
+        return None
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex):
+        index = index.strftime('%Y-%m-%d')
+    values = df.astype(object).where(df.notna(), None).to_numpy().tolist()
+    return {
+        'index': [str(i) for i in index],
+        'columns': [str(c) for c in df.columns],
+        'data': [[float(v) if isinstance(v, (int, float, np.number)) else v for v in row] for row in values]
+    }
+
+def read_table(path, **kwargs):
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, encoding='utf-8-sig', **kwargs)
+
+def weekly_engagement():
+    if not os.path.exists(ROLLUPS_DIR):
+        return None
+    series = {}
+    for file in sorted(os.listdir(ROLLUPS_DIR)):
+        if file.endswith('_weekly.csv'):
+            group = file.replace('_weekly.csv', '')
+            rollup = load_rollup(group, 'weekly')
+            series[group] = (rollup['engagement'] / rollup['posts']).round(2)
+    if not series:
+        return None
+    engagement = pd.DataFrame(series).sort_index()
+    return engagement[sorted(engagement.columns, key=lambda group: group != MAIN_GROUP)]
+
+def posting_matrix():
+    model = read_table(POSTING_MODEL_FILE, index_col=['weekday', 'hour'])
+    if model is None:
+        return None
+    matrix = model['score'].unstack('hour').round(3)
+    matrix.index = [WEEKDAYS[day] for day in matrix.index]
+    return matrix
+
+def age_curves():
+    histograms = load_age_histograms()
+    if histograms.empty:
+        return None
+    return kde_curves(histograms).round(5)
+
+def content_shares():
+    features = read_table(FEATURES_FILE, index_col='group')
+    if features is None:
+        return None
+    return features[['engagement', 'case_study', 'educational', 'promo']].round(3)
+
+def collect_aggregates():
+    strategy = None
+    if os.path.exists(STRATEGY_FILE):
+        with open(STRATEGY_FILE, 'r', encoding='utf-8') as f:
+            strategy = json.load(f)
+    metrics = load_group_metrics()
+    return {
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'summary': frame_payload(read_table(SUMMARY_FILE, index_col=0)),
+        'activity': frame_payload(load_activity_index()),
+        'age_curves': frame_payload(age_curves()),
+        'content': frame_payload(content_shares()),
+        'engagement': frame_payload(weekly_engagement()),
+        'er': frame_payload(metrics[['subscribers', 'er']].round(3) if metrics is not None else None),
+        'reach': frame_payload(load_reach()),
+        'posting': frame_payload(posting_matrix()),
+        'growth': frame_payload(growth_summary()),
+        'segments': frame_payload(read_table(SEGMENT_SHARES_FILE, index_col=0)),
+        'strategy': strategy
+    }
+
+def build_report(output_dir=REPORT_DIR):
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    payload = json.dumps(collect_aggregates(), ensure_ascii=False)
+    with open(f'{output_dir}/dashboard.json', 'w', encoding='utf-8') as f:
+        f.write(payload)
+    with open(f'{output_dir}/dashboard.html', 'w', encoding='utf-8') as f:
+        f.write(HTML_TEMPLATE.replace('__DATA__', payload.replace('</', '<\\/')))
+    print(f"Отчёт сохранён в {output_dir}/dashboard.html за {time.perf_counter() - start:.2f} с")
+
+HTML_TEMPLATE = '''<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Laser33: аналитика сообщества</title>
+<style>
+body { font-family: sans-serif; margin: 24px; color: #222; background: #fafafa; }
+section { background: #fff; border: 1px solid #ddd; border-radius: 6px; padding: 16px; margin-bottom: 20px; }
+h1 { font-size: 22px; } h2 { font-size: 17px; margin-top: 0; }
+table { border-collapse: collapse; font-size: 13px; }
+td, th { border: 1px solid #ddd; padding: 4px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.legend span { display: inline-block; margin-right: 14px; font-size: 13px; }
+.legend i { display: inline-block; width: 12px; height: 12px; margin-right: 4px; vertical-align: middle; }
+.empty { color: #888; }
+</style>
+</head>
+<body>
+<h1>Laser33: аналитика сообщества</h1>
+<p id="generated"></p>
+<section><h2>Вовлеченность по неделям</h2><div id="engagement"></div></section>
+<section><h2>Engagement Rate, %</h2><div id="er"></div></section>
+<section><h2>Типы контента (доля постов)</h2><div id="content"></div></section>
+<section><h2>Возрастное распределение</h2><div id="age_curves"></div></section>
+<section><h2>Активная аудитория</h2><div id="activity"></div></section>
+<section><h2>Сводка по конкурентам</h2><div id="summary"></div></section>
+<section><h2>Рост и отток за 30 дней</h2><div id="growth"></div></section>
+<section><h2>Пересечение аудиторий</h2><div id="reach"></div></section>
+<section><h2>Время публикаций (индекс вовлеченности)</h2><div id="posting"></div></section>
+<section><h2>Сегменты интересов</h2><div id="segments"></div></section>
+<section><h2>Стратегия</h2><div id="strategy"></div></section>
+<script>
+const DATA = __DATA__;
+const COLORS = ['#c44e52', '#4c72b0', '#55a868', '#8172b2', '#ccb974', '#64b5cd', '#dd8452', '#937860'];
+const NS = 'http://www.w3.org/2000/svg';
+const esc = s => String(s).replace(/[&<>]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;'}[c]));
+
+function svg(tag, attrs, parent) {
+  const el = document.createElementNS(NS, tag);
+  for (const k in attrs) el.setAttribute(k, attrs[k]);
+  if (parent) parent.appendChild(el);
+  return el;
+}
+
+function empty(el) { el.innerHTML = '<p class="empty">Нет данных</p>'; }
+
+function legend(el, names) {
+  const div = document.createElement('div');
+  div.className = 'legend';
+  names.forEach((n, i) => { div.innerHTML += `<span><i style="background:${COLORS[i % COLORS.length]}"></i>${esc(n)}</span>`; });
+  el.appendChild(div);
+}
+
+function lineChart(el, frame) {
+  if (!frame) return empty(el);
+  const w = 900, h = 300, pad = 40;
+  const values = frame.data.flat().filter(v => v !== null);
+  const max = Math.max(...values, 1e-9);
+  const root = svg('svg', {width: w, height: h}, el);
+  svg('line', {x1: pad, y1: h - pad, x2: w - 10, y2: h - pad, stroke: '#999'}, root);
+  svg('text', {x: 2, y: pad, 'font-size': 11}, root).textContent = max.toFixed(2);
+  const n = Math.max(frame.index.length - 1, 1);
+  frame.columns.forEach((col, c) => {
+    let d = '';
+    frame.data.forEach((row, i) => {
+      if (row[c] === null) return;
+      const x = pad + i / n * (w - pad - 10), y = h - pad - row[c] / max * (h - 2 * pad);
+      d += (d ? 'L' : 'M') + x.toFixed(1) + ' ' + y.toFixed(1);
+    });
+    svg('path', {d: d, fill: 'none', stroke: COLORS[c % COLORS.length], 'stroke-width': c === 0 ? 3 : 1.5}, root);
+  });
+  [0, frame.index.length - 1].forEach(i => {
+    svg('text', {x: pad + i / n * (w - pad - 10), y: h - pad + 16, 'font-size': 11, 'text-anchor': i ? 'end' : 'start'}, root).textContent = frame.index[i];
+  });
+  legend(el, frame.columns);
+}
+
+function barChart(el, frame, columns) {
+  if (!frame) return empty(el);
+  const cols = columns || frame.columns;
+  const idx = cols.map(c => frame.columns.indexOf(c));
+  const w = 900, h = 300, pad = 40;
+  const values = frame.data.flatMap(row => idx.map(i => row[i])).filter(v => v !== null);
+  const max = Math.max(...values, 1e-9);
+  const root = svg('svg', {width: w, height: h}, el);
+  const groupW = (w - pad) / frame.index.length, barW = groupW * 0.8 / cols.length;
+  frame.data.forEach((row, g) => {
+    idx.forEach((i, s) => {
+      const v = row[i] || 0, bh = v / max * (h - 2 * pad);
+      svg('rect', {x: pad + g * groupW + s * barW, y: h - pad - bh, width: barW - 1, height: bh, fill: COLORS[s % COLORS.length]}, root);
+    });
+    svg('text', {x: pad + g * groupW, y: h - pad + 16, 'font-size': 11}, root).textContent = frame.index[g];
+  });
+  svg('text', {x: 2, y: pad, 'font-size': 11}, root).textContent = max.toFixed(2);
+  legend(el, cols);
+}
+
+function table(el, frame, heat) {
+  if (!frame) return empty(el);
+  const values = frame.data.flat().filter(v => typeof v === 'number');
+  const min = Math.min(...values), max = Math.max(...values);
+  let html = '<table><tr><th></th>' + frame.columns.map(c => `<th>${esc(c)}</th>`).join('') + '</tr>';
+  frame.data.forEach((row, r) => {
+    html += `<tr><td>${esc(frame.index[r])}</td>` + row.map(v => {
+      const text = v === null ? '' : (typeof v === 'number' ? +v.toFixed(3) : esc(v));
+      const bg = heat && typeof v === 'number' ? `background:rgba(76,114,176,${((v - min) / (max - min || 1)).toFixed(2)})` : '';
+      return `<td style="${bg}">${text}</td>`;
+    }).join('') + '</tr>';
+  });
+  el.innerHTML = html + '</table>';
+}
+
+function strategy(el, s) {
+  if (!s) return empty(el);
+  const list = items => '<ul>' + (items.length ? items : ['Недостаточно данных']).map(i => `<li>${esc(i)}</li>`).join('') + '</ul>';
+  const p = s.posting_schedule || {};
+  el.innerHTML = '<h3>Контент</h3>' + list(s.content_types || []) +
+    '<h3>Время публикаций</h3>' + list([`Часы: ${(p.best_hours || []).join(', ')}`, `Дни: ${(p.best_days || []).join(', ')}`].concat(p.best_slots ? [`Слоты: ${p.best_slots.join(', ')}`] : [])) +
+    '<h3>Коллаборации</h3>' + list(s.collaborations || []) +
+    '<h3>KPI</h3>' + list(Object.entries(s.kpi || {}).map(([k, v]) => `${k}: ${v}`));
+}
+
+document.getElementById('generated').textContent = 'Сформировано: ' + DATA.generated_at;
+lineChart(document.getElementById('engagement'), DATA.engagement);
+barChart(document.getElementById('er'), DATA.er, ['er']);
+barChart(document.getElementById('content'), DATA.content, ['case_study', 'educational', 'promo']);
+lineChart(document.getElementById('age_curves'), DATA.age_curves);
+table(document.getElementById('activity'), DATA.activity, false);
+table(document.getElementById('summary'), DATA.summary, false);
+table(document.getElementById('reach'), DATA.reach, false);
+table(document.getElementById('growth'), DATA.growth, false);
+table(document.getElementById('posting'), DATA.posting, true);
+table(document.getElementById('segments'), DATA.segments, true);
+strategy(document.getElementById('strategy'), DATA.strategy);
+</script>
+</body>
+</html>
+'''
+
+if __name__ == "__main__":
+    build_report()
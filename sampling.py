@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+from statistics import NormalDist
+
+SAMPLES_DIR = 'results/samples'
+ESTIMATES_FILE = 'results/sample_estimates.csv'
+SAMPLE_PAGE = 100
+DEFAULT_MARGIN = 0.03
+DEFAULT_CONFIDENCE = 0.95
+TOP_CITIES = 5
+
+def z_score(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def fpc(n, population):
+    if population <= 1:
+        return 0.0
+    return np.sqrt(max(population - n, 0) / (population - 1))
+
+def sample_size(population, margin=DEFAULT_MARGIN, confidence=DEFAULT_CONFIDENCE):
+    n0 = z_score(confidence) ** 2 * 0.25 / margin ** 2
+    return int(min(population, np.ceil(n0 / (1 + (n0 - 1) / population))))
+
+def sample_offsets(population, n, page=SAMPLE_PAGE, seed=None):
+    pages = int(np.ceil(n / page))
+    stratum = population / pages
+    if stratum < page:
+        return None
+    rng = np.random.default_rng(seed)
+    starts = np.arange(pages) * stratum
+    return (starts + rng.random(pages) * (stratum - page)).astype(np.int64)
+
+def interval(estimate, margin):
+    return {'estimate': round(float(estimate), 4), 'low': round(float(estimate - margin), 4), 'high': round(float(estimate + margin), 4)}
+
+def proportion_ci(hits, n, population, confidence=DEFAULT_CONFIDENCE):
+    p = hits / n if n else 0.0
+    margin = z_score(confidence) * np.sqrt(p * (1 - p) / n) * fpc(n, population) if n else 0.0
+    return interval(p, margin)
+
+def mean_ci(values, population, confidence=DEFAULT_CONFIDENCE):
+    values = pd.to_numeric(pd.Series(values), errors='coerce').dropna()
+    n = len(values)
+    if n < 2:
+        return None
+    margin = z_score(confidence) * values.std(ddof=1) / np.sqrt(n) * fpc(n, population)
+    return interval(values.mean(), margin)
+
+def sample_estimates(df, population, confidence=DEFAULT_CONFIDENCE):
+    n = len(df)
+    sex = pd.to_numeric(df['sex'], errors='coerce').fillna(0) if 'sex' in df.columns else pd.Series(0, index=df.index)
+    estimates = {
+        'population': int(population),
+        'sample_size': int(n),
+        'confidence': confidence,
+        'age_mean': mean_ci(df['age'], population, confidence) if 'age' in df.columns else None,
+        'female_share': proportion_ci(int((sex == 1).sum()), n, population, confidence),
+        'male_share': proportion_ci(int((sex == 2).sum()), n, population, confidence),
+        'top_cities': {}
+    }
+    if 'city' in df.columns:
+        cities = df['city'].replace('', np.nan).dropna()
+        for city, hits in cities.value_counts().head(TOP_CITIES).items():
+            share = proportion_ci(int(hits), n, population, confidence)
+            share['members'] = int(round(share['estimate'] * population))
+            estimates['top_cities'][str(city)] = share
+    return estimates
+
+def estimates_row(name, estimates):
+    row = {'group': name, 'population': estimates['population'], 'sample_size': estimates['sample_size']}
+    for key in ['age_mean', 'female_share', 'male_share']:
+        if estimates[key]:
+            row.update({key: estimates[key]['estimate'], f'{key}_low': estimates[key]['low'], f'{key}_high': estimates[key]['high']})
+    return row
+
+def save_sample(name, df, estimates):
+    os.makedirs(SAMPLES_DIR, exist_ok=True)
+    df.to_csv(f'{SAMPLES_DIR}/{name}_sample.csv', index=False, encoding='utf-8-sig')
+    with open(f'{SAMPLES_DIR}/{name}_estimates.json', 'w', encoding='utf-8') as f:
+        json.dump(estimates, f, ensure_ascii=False, indent=2)
+    table = pd.read_csv(ESTIMATES_FILE, index_col='group') if os.path.exists(ESTIMATES_FILE) else pd.DataFrame()
+    row = pd.DataFrame([estimates_row(name, estimates)]).set_index('group')
+    pd.concat([table.drop(index=name, errors='ignore'), row]).to_csv(ESTIMATES_FILE)
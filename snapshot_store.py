@@ -0,0 +1,160 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from subscriber_schema import apply_subscriber_schema
+from activity_index import add_activity_bucket, recency_counts, ACTIVE_DAYS
+
+SNAPSHOT_DB = 'results/snapshots.sqlite'
+IDS_DIR = 'results/snapshot_ids'
+TOP_CITIES = 5
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    group_name TEXT NOT NULL,
+    collected_at INTEGER NOT NULL,
+    total_members INTEGER NOT NULL,
+    avg_age REAL,
+    female_share REAL,
+    male_share REAL,
+    active_members INTEGER,
+    joined_count INTEGER,
+    left_count INTEGER,
+    top_cities TEXT,
+    PRIMARY KEY (group_name, collected_at)
+) WITHOUT ROWID
+'''
+
+def connect(path=SNAPSHOT_DB):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute(SCHEMA)
+    return connection
+
+def ids_path(group_name):
+    return f'{IDS_DIR}/{group_name}.npy'
+
+def member_changes(group_name, ids):
+    path = ids_path(group_name)
+    joined = left = None
+    if os.path.exists(path):
+        previous = np.load(path)
+        joined = int(np.setdiff1d(ids, previous, assume_unique=True).size)
+        left = int(np.setdiff1d(previous, ids, assume_unique=True).size)
+    return joined, left
+
+def save_member_ids(group_name, ids):
+    os.makedirs(IDS_DIR, exist_ok=True)
+    np.save(ids_path(group_name), ids)
+
+def snapshot_metrics(df):
+    df = add_activity_bucket(apply_subscriber_schema(df.copy()))
+    total = len(df)
+    sex = df['sex'].value_counts() if 'sex' in df.columns else pd.Series(dtype='int64')
+    metrics = {
+        'total_members': total,
+        'avg_age': float(df['age'].mean()) if 'age' in df.columns and df['age'].notna().any() else None,
+        'female_share': float(sex.get(1, 0) / total) if total else None,
+        'male_share': float(sex.get(2, 0) / total) if total else None,
+        'active_members': recency_counts(df)[f'active_{ACTIVE_DAYS}d'] if 'activity_bucket' in df.columns else None,
+        'top_cities': None
+    }
+    if 'city' in df.columns:
+        cities = df['city'].value_counts().head(TOP_CITIES)
+        metrics['top_cities'] = json.dumps({str(k): int(v) for k, v in cities.items() if v}, ensure_ascii=False)
+    return metrics
+
+def record_snapshot(group_name, df, collected_at=None):
+    if df.empty:
+        print(f"Пустой список подписчиков {group_name}: снимок не сохранён")
+        return None
+    metrics = snapshot_metrics(df)
+    ids = np.unique(df['id'].dropna().to_numpy(dtype=np.int64)) if 'id' in df.columns else np.array([], dtype=np.int64)
+    joined, left = member_changes(group_name, ids)
+    row = {
+        'group_name': group_name,
+        'collected_at': int(collected_at or time.time()),
+        'joined_count': joined,
+        'left_count': left,
+        **metrics
+    }
+    with closing(connect()) as connection, connection:
+        connection.execute(
+            f"INSERT OR REPLACE INTO snapshots ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values())
+        )
+    save_member_ids(group_name, ids)
+    return row
+
+def load_snapshots(group_name=None, since=None):
+    if not os.path.exists(SNAPSHOT_DB):
+        return pd.DataFrame()
+    query = 'SELECT * FROM snapshots WHERE 1=1'
+    params = []
+    if group_name is not None:
+        query += ' AND group_name = ?'
+        params.append(group_name)
+    if since is not None:
+        query += ' AND collected_at >= ?'
+        params.append(int(since))
+    with closing(connect()) as connection:
+        snapshots = pd.read_sql_query(query + ' ORDER BY group_name, collected_at', connection, params=params)
+    snapshots['collected_at'] = pd.to_datetime(snapshots['collected_at'], unit='s')
+    return snapshots
+
+def window(group_name, days):
+    return load_snapshots(group_name, since=time.time() - days * 86400)
+
+def growth_rate(group_name, days=30):
+    snapshots = window(group_name, days)
+    if len(snapshots) < 2:
+        return None
+    first, last = snapshots.iloc[0], snapshots.iloc[-1]
+    elapsed = (last['collected_at'] - first['collected_at']) / pd.Timedelta(days=1)
+    change = int(last['total_members'] - first['total_members'])
+    return {
+        'change': change,
+        'percent': round(float(change / first['total_members'] * 100), 2) if first['total_members'] else None,
+        'per_day': round(change / elapsed, 2) if elapsed else None
+    }
+
+def demographic_drift(group_name, days=30):
+    snapshots = window(group_name, days)
+    if len(snapshots) < 2:
+        return None
+    columns = ['avg_age', 'female_share', 'male_share']
+    drift = (snapshots[columns].iloc[-1] - snapshots[columns].iloc[0]).round(4).to_dict()
+    active_share = snapshots['active_members'] / snapshots['total_members']
+    drift['active_share'] = round(float(active_share.iloc[-1] - active_share.iloc[0]), 4)
+    return drift
+
+def churn(group_name, days=30):
+    snapshots = window(group_name, days)
+    if len(snapshots) < 2:
+        return None
+    changes = snapshots.iloc[1:]
+    base = snapshots['total_members'].iloc[0]
+    left = int(changes['left_count'].fillna(0).sum())
+    return {
+        'joined': int(changes['joined_count'].fillna(0).sum()),
+        'left': left,
+        'churn_rate': round(float(left / base * 100), 2) if base else None
+    }
+
+def growth_summary(days=30):
+    snapshots = load_snapshots(since=time.time() - days * 86400)
+    if snapshots.empty:
+        return snapshots
+    rows = {}
+    for group_name in snapshots['group_name'].unique():
+        rows[group_name] = {
+            **(growth_rate(group_name, days) or {}),
+            **(churn(group_name, days) or {})
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+if __name__ == "__main__":
+    print(growth_summary())
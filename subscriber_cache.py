@@ -0,0 +1,99 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+import tempfile
+import time
+from subscriber_schema import read_subscribers
+
+CACHE_DIR = 'results/subscriber_cache'
+META_FILE = 'meta.json'
+LOAD_RETRIES = 3
+
+def cache_dir(path):
+    return f"{CACHE_DIR}/{os.path.splitext(path)[0].replace('/', '__')}"
+
+def source_signature(path):
+    stat = os.stat(path)
+    return {'source': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def read_meta(directory):
+    try:
+        with open(f'{directory}/{META_FILE}', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def is_fresh(path):
+    meta = read_meta(cache_dir(path))
+    if meta is None:
+        return False
+    signature = source_signature(path)
+    return all(meta.get(key) == value for key, value in signature.items())
+
+def encode_column(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime', series.astype('datetime64[s]').to_numpy().view(np.int64), None
+    if pd.api.types.is_bool_dtype(series) or (pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype)):
+        return 'numeric', series.to_numpy(), None
+    categorical = series.astype('category')
+    categories = categorical.cat.categories
+    codes = categorical.cat.codes.to_numpy(dtype=np.int32)
+    return 'category', codes, [str(c) for c in categories]
+
+def build_cache(path):
+    directory = cache_dir(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=CACHE_DIR, prefix='build_')
+    df = read_subscribers(path)
+    columns = {}
+    for column in df.columns:
+        kind, values, categories = encode_column(df[column])
+        np.save(f'{tmp}/{column}.npy', np.ascontiguousarray(values))
+        columns[column] = {'kind': kind}
+        if categories is not None:
+            with open(f'{tmp}/{column}.categories.json', 'w', encoding='utf-8') as f:
+                json.dump(categories, f, ensure_ascii=False)
+    meta = {**source_signature(path), 'rows': len(df), 'columns': columns}
+    with open(f'{tmp}/{META_FILE}', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    aside = f'{tmp}.old'
+    try:
+        if os.path.exists(directory):
+            os.replace(directory, aside)
+        os.replace(tmp, directory)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(aside, ignore_errors=True)
+    print(f"Бинарный кэш {path}: {len(df)} строк, {len(columns)} колонок")
+
+def open_column(directory, column, kind):
+    values = np.load(f'{directory}/{column}.npy', mmap_mode='r')
+    if kind == 'datetime':
+        return pd.Series(values.view('datetime64[s]'), copy=False)
+    if kind == 'numeric':
+        return pd.Series(values, copy=False)
+    with open(f'{directory}/{column}.categories.json', 'r', encoding='utf-8') as f:
+        categories = json.load(f)
+    return pd.Series(pd.Categorical.from_codes(values, categories=categories))
+
+def load_subscribers(path, columns=None):
+    directory = cache_dir(path)
+    for attempt in range(LOAD_RETRIES):
+        if not is_fresh(path):
+            build_cache(path)
+        meta = read_meta(directory)
+        try:
+            if meta is None:
+                raise FileNotFoundError(directory)
+            names = [c for c in (columns or meta['columns']) if c in meta['columns']]
+            return pd.DataFrame({c: open_column(directory, c, meta['columns'][c]['kind']) for c in names}, copy=False)
+        except FileNotFoundError:
+            time.sleep(0.1 * (attempt + 1))
+    print(f"Кэш {path} недоступен, чтение CSV")
+    df = read_subscribers(path)
+    return df[[c for c in columns if c in df.columns]] if columns else df
+
+def clear_cache():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,34 @@
+import pandas as pd
+import numpy as np
+
+CATEGORY_COLUMNS = ['city', 'country', 'university', 'faculty', 'position', 'gender']
+
+def compact_age(age):
+    age = pd.to_numeric(age, errors='coerce')
+    if age.notna().all() and len(age) > 0:
+        return age.astype(np.int16)
+    return age.astype(np.float32)
+
+def parse_last_seen(last_seen):
+    if pd.api.types.is_numeric_dtype(last_seen):
+        parsed = pd.to_datetime(last_seen, unit='s', errors='coerce')
+    else:
+        parsed = pd.to_datetime(last_seen, format='ISO8601', errors='coerce')
+    return parsed.astype('datetime64[s]')
+
+def apply_subscriber_schema(df):
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category').cat.remove_unused_categories()
+    if 'sex' in df.columns:
+        df['sex'] = pd.to_numeric(df['sex'], errors='coerce').fillna(0).astype(np.int8)
+    if 'age' in df.columns:
+        df['age'] = compact_age(df['age'])
+    if 'last_seen' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['last_seen']):
+        df['last_seen'] = parse_last_seen(df['last_seen'])
+    return df
+
+def read_subscribers(path, **kwargs):
+    dtypes = {col: 'category' for col in CATEGORY_COLUMNS}
+    df = pd.read_csv(path, dtype=dtypes, **kwargs)
+    return apply_subscriber_schema(df)
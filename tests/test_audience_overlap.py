@@ -0,0 +1,26 @@
+import numpy as np
+import audience_overlap
+from post_store import MAIN_GROUP
+
+def groups():
+    return {
+        MAIN_GROUP: np.arange(0, 30_000, dtype=np.int64),
+        'rival': np.arange(20_000, 60_000, dtype=np.int64),
+        'small': np.arange(55_000, 56_000, dtype=np.int64)
+    }
+
+def test_exact_overlap_counts_shared_and_unique_members():
+    overlap, reach, _ = audience_overlap.compute_overlap(groups(), estimate=False)
+    assert overlap.loc[MAIN_GROUP, 'rival'] == 10_000
+    assert overlap.loc['rival', 'small'] == 1_000
+    assert reach.loc[MAIN_GROUP, 'unique_reach'] == 20_000
+    assert reach.loc['rival', 'unique_reach'] == 29_000
+    assert reach.loc['small', 'unique_reach'] == 0
+    assert reach.loc['rival', 'new_reach'] == 30_000
+
+def test_estimate_is_close_to_exact():
+    exact, exact_reach, _ = audience_overlap.compute_overlap(groups(), estimate=False)
+    estimate, estimate_reach, _ = audience_overlap.compute_overlap(groups(), estimate=True)
+    assert (np.diag(estimate) == np.diag(exact)).all()
+    assert abs(estimate.loc[MAIN_GROUP, 'rival'] - exact.loc[MAIN_GROUP, 'rival']) / 10_000 < 0.1
+    assert abs(estimate_reach.loc['rival', 'unique_reach'] - 29_000) / 29_000 < 0.1
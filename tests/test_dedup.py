@@ -0,0 +1,31 @@
+import pandas as pd
+import dedup
+
+TEMPLATE = 'Лазерная резка фанеры и акрила на заказ во Владимире звоните сегодня'
+
+def test_near_duplicates_cluster_across_groups():
+    texts = [TEMPLATE, TEMPLATE + ' скидка', 'Совсем другой текст про гравировку подарков к празднику', TEMPLATE]
+    posts = pd.DataFrame({'group': ['a', 'a', 'b', 'b'], 'id': [1, 2, 3, 4], 'text': texts})
+    index, signatures = dedup.text_signatures(*dedup.update_signatures(posts))
+    clusters = dedup.find_duplicate_clusters(index, signatures)
+    assert set(zip(clusters['group'], clusters['id'])) == {('a', 1), ('a', 2), ('b', 4)}
+    assert (clusters['groups'] == 2).all()
+
+def test_oversized_bucket_stays_one_cluster():
+    count = dedup.MAX_BUCKET + 100
+    posts = pd.DataFrame({'group': 'a', 'id': range(count), 'text': [f'{TEMPLATE} номер {i}' for i in range(count)]})
+    signatures, _ = dedup.minhash_signatures(posts['text'])
+    signatures[:, :dedup.ROWS] = signatures[0, :dedup.ROWS]
+    signatures[:, dedup.ROWS:] = signatures[0, dedup.ROWS:]
+    signatures[:, -1] = range(count)
+    clusters = dedup.find_duplicate_clusters(posts, signatures)
+    assert clusters['cluster'].nunique() == 1
+    assert len(clusters) == count
+
+def test_short_posts_are_indexed_once():
+    posts = pd.DataFrame({'group': 'a', 'id': [1, 2], 'text': ['коротко', TEMPLATE]})
+    index, _ = dedup.update_signatures(posts)
+    assert index['has_text'].tolist() == [False, True]
+    index, signatures = dedup.update_signatures(posts)
+    assert len(index) == 2 and len(signatures) == 2
+    assert len(dedup.text_signatures(index, signatures)[0]) == 1
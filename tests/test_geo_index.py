@@ -0,0 +1,43 @@
+import time
+import pandas as pd
+import geo_index
+
+def members(rows):
+    return pd.DataFrame(rows, columns=['id', 'first_name', 'age', 'city_id', 'city', 'country_id', 'country', 'last_seen'])
+
+def test_index_counts_all_non_deleted_members():
+    now = int(time.time())
+    geo_index.index_members('ours', members([
+        [1, 'Анна', 30, 1, 'Владимир', 1, 'Россия', now],
+        [2, 'Иван', None, 1, 'Владимир', 1, 'Россия', now - 60 * 86400],
+        [3, 'DELETED', None, 1, 'Владимир', 1, 'Россия', None],
+        [4, 'Олег', 40, 2, 'Москва', 1, 'Россия', now]
+    ]))
+    geo_index.index_members('rival', members([
+        [5, 'Петр', 25, 2, 'Москва', 1, 'Россия', now],
+        [6, 'Мария', 25, 2, 'Москва', 1, 'Россия', now]
+    ]))
+    counts = geo_index.city_counts()
+    assert counts.loc[1, 'ours'] == 2
+    assert counts.loc[2, 'rival'] == 2
+    assert geo_index.city_counts(active_days=7).loc[1, 'ours'] == 1
+    share = geo_index.market_share(min_audience=1)
+    assert share.loc[2, 'rival'] == 66.67
+
+def test_reindexing_replaces_group_column():
+    now = int(time.time())
+    geo_index.index_members('ours', members([[1, 'Анна', 30, 1, 'Владимир', 1, 'Россия', now]]))
+    geo_index.index_members('ours', members([[1, 'Анна', 30, 2, 'Москва', 1, 'Россия', now]]))
+    counts = geo_index.city_counts()
+    assert counts['ours'].sum() == 1
+    assert counts.loc[2, 'ours'] == 1
+
+def test_labels_disambiguate_city_names():
+    now = int(time.time())
+    geo_index.index_members('ours', members([
+        [1, 'Анна', 30, 10, 'Кировск', 1, 'Россия', now],
+        [2, 'Иван', 30, 11, 'Кировск', 2, 'Украина', now]
+    ]))
+    labels = geo_index.region_labels()
+    assert labels[10] == 'Кировск (Россия)'
+    assert labels[11] == 'Кировск (Украина)'
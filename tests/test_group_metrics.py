@@ -0,0 +1,36 @@
+import pandas as pd
+import group_metrics
+from post_store import MAIN_GROUP
+
+class FakeSession:
+    def __init__(self, groups):
+        self.groups = groups
+        self.calls = 0
+
+    def method(self, name, params):
+        self.calls += 1
+        return {'groups': self.groups}
+
+def test_er_uses_group_size():
+    posts = pd.DataFrame({
+        'group': [MAIN_GROUP, MAIN_GROUP, 'rival'],
+        'id': [1, 2, 3],
+        'likes': [10, 30, 5],
+        'reposts': [0, 0, 5]
+    })
+    sizes = {
+        MAIN_GROUP: {'id': group_metrics.MAIN_GROUP_ID, 'name': 'Main', 'members_count': 1000},
+        'rival': {'id': -2, 'name': 'Rival', 'members_count': 100}
+    }
+    metrics = group_metrics.compute_group_metrics(posts, sizes)
+    assert metrics.loc[MAIN_GROUP, 'er'] == 2.0
+    assert metrics.loc['rival', 'er'] == 10.0
+    assert metrics.loc[MAIN_GROUP, 'posts'] == 2
+
+def test_refetch_keeps_cached_groups():
+    group_metrics.save_group_sizes({MAIN_GROUP: {'id': group_metrics.MAIN_GROUP_ID, 'name': 'Main', 'members_count': 1000}})
+    session = FakeSession([{'id': 2, 'screen_name': 'rival', 'name': 'Rival', 'members_count': 100}])
+    sizes = group_metrics.load_group_sizes(session, ['rival'])
+    assert session.calls == 1
+    assert set(sizes) == {MAIN_GROUP, 'rival'}
+    assert set(group_metrics.load_group_sizes()) == {MAIN_GROUP, 'rival'}
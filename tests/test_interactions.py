@@ -0,0 +1,68 @@
+import pandas as pd
+import interactions
+from post_store import MAIN_GROUP
+
+REPLIES = [{'id': 100 + i, 'from_id': 500 + i, 'date': 0, 'text': 'ответ'} for i in range(15)]
+COMMENTS = [
+    {'id': 10, 'from_id': 7, 'date': 0, 'text': 'a', 'thread': {'count': 15, 'items': REPLIES[:10]}},
+    {'id': 11, 'from_id': 8, 'date': 0, 'text': 'b', 'thread': {'count': 0, 'items': []}},
+    {'id': 12, 'from_id': -1, 'date': 0, 'text': 'c', 'thread': {'count': 0, 'items': []}}
+]
+
+class FakeVk:
+    def __init__(self, failures=1, thread_failures=1):
+        self.failures = failures
+        self.thread_failures = thread_failures
+
+    def execute(self, code, v):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('Too many requests')
+        return [self.call(method, params) for method, params in code]
+
+    def call(self, method, params):
+        if method == 'likes.getList':
+            users = [1, 2, 3]
+            return {'count': 3, 'items': users[params['offset']:params['offset'] + params['count']]}
+        if 'comment_id' in params:
+            if self.thread_failures:
+                self.thread_failures -= 1
+                return False
+            return {'count': len(REPLIES), 'items': REPLIES[params['offset']:params['offset'] + params['count']]}
+        return {'count': 18, 'current_level_count': len(COMMENTS), 'items': COMMENTS[params['offset']:params['offset'] + params['count']]}
+
+def run(vk, state, monkeypatch):
+    monkeypatch.setattr(interactions, 'build_execute_code', lambda calls: calls)
+    monkeypatch.setattr(interactions.time, 'sleep', lambda seconds: None)
+    posts = pd.DataFrame({'group': [MAIN_GROUP], 'id': [1], 'comments': [18], 'likes': [3]})
+    interactions.harvest(vk, posts, state, {MAIN_GROUP: interactions.GROUP_ID})
+
+def test_failed_batches_are_requeued(workdir, monkeypatch):
+    (workdir / 'results').mkdir()
+    state = {}
+    run(FakeVk(), state, monkeypatch)
+    seen = state[MAIN_GROUP]['1']
+    assert 'progress' not in seen
+    assert seen['comments'] == 18 and seen['likes'] == 3
+    assert seen['last_comment_id'] == 114
+    comments = interactions.load_comments()
+    assert len(comments) == 18
+    assert comments['comment_id'].is_unique
+
+def test_exhausted_retries_leave_post_pending(workdir, monkeypatch):
+    (workdir / 'results').mkdir()
+    state = {}
+    run(FakeVk(failures=0, thread_failures=interactions.RETRIES), state, monkeypatch)
+    seen = state[MAIN_GROUP]['1']
+    assert 'progress' not in seen
+    assert 'comments' not in seen
+    run(FakeVk(failures=0, thread_failures=0), state, monkeypatch)
+    assert state[MAIN_GROUP]['1']['comments'] == 18
+
+def test_repeated_rows_are_deduplicated(workdir, monkeypatch):
+    (workdir / 'results').mkdir()
+    run(FakeVk(failures=0, thread_failures=0), {}, monkeypatch)
+    run(FakeVk(failures=0, thread_failures=0), {}, monkeypatch)
+    loaded = interactions.load_interactions()
+    assert (loaded['type'] == 'like').sum() == 3
+    assert (loaded['type'] == 'comment').sum() == 17
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+import interests_engine
+
+pytest.importorskip('sklearn')
+
+CRAFT = 'резка гравировка фанера станок чертежи'
+SPORT = 'футбол хоккей бег плавание тренировки'
+
+def write_group(path, texts):
+    pd.DataFrame({'id': range(len(texts)), 'interests': texts}).to_csv(path, index=False)
+
+def test_segments_separate_interest_profiles(monkeypatch):
+    monkeypatch.setattr(interests_engine, 'load_morph', lambda: interests_engine.strip_ending)
+    monkeypatch.setattr(interests_engine, 'MIN_DF', 2)
+    monkeypatch.setattr(interests_engine, 'MAX_DF_RATIO', 0.9)
+    write_group('makers.csv', [CRAFT] * 40 + [SPORT] * 10)
+    write_group('athletes.csv', [SPORT] * 40 + [CRAFT] * 10)
+    segments, shares = interests_engine.cluster_interests({'makers': 'makers.csv', 'athletes': 'athletes.csv'}, n_segments=2)
+    craft = next(s for s, terms in segments['top_terms'].items() if 'фанер' in terms)
+    assert shares.loc['makers', craft] == pytest.approx(0.8)
+    assert shares.loc['athletes', craft] == pytest.approx(0.2)
+
+def test_frequencies_are_cached_per_group(monkeypatch):
+    monkeypatch.setattr(interests_engine, 'load_morph', lambda: interests_engine.strip_ending)
+    write_group('makers.csv', [CRAFT, CRAFT, 'для фанера'])
+    counts = interests_engine.load_frequencies('makers', 'makers.csv')
+    assert counts['фанер'] == 3
+    assert 'для' not in counts.index
+    cached = interests_engine.load_frequencies('makers', 'makers.csv')
+    assert cached['фанер'] == 3
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+import posting_time
+
+def posts(rows):
+    df = pd.DataFrame(rows, columns=['group', 'date', 'engagement', 'views'])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def test_lift_is_relative_to_each_group():
+    model = posting_time.build_posting_model(posts([
+        ['big', '2024-01-01 18:00', 300, 1000],
+        ['big', '2024-01-01 09:00', 100, 1000],
+        ['small', '2024-01-02 18:00', 3, 10],
+        ['small', '2024-01-02 09:00', 1, 10]
+    ]))
+    assert model.loc[(0, 18), 'lift_sum'] == pytest.approx(1.5)
+    assert model.loc[(1, 9), 'lift_sum'] == pytest.approx(0.5)
+    assert posting_time.best_hours(model, 1) == [18]
+
+def test_posts_without_views_use_engagement_within_group():
+    model = posting_time.build_posting_model(posts([
+        ['old', '2024-01-03 12:00', 30, 0],
+        ['old', '2024-01-03 20:00', 10, 0]
+    ]))
+    assert model.loc[(2, 12), 'lift_sum'] == 1.5
+    assert model['posts'].sum() == 2
+
+def test_no_usable_rates_returns_none():
+    assert posting_time.build_posting_model(posts([
+        ['g', '2024-01-01 10:00', 0, 100],
+        ['g', '2024-01-01 11:00', 0, 0]
+    ])) is None
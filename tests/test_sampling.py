@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sampling
+
+def test_sample_size_matches_textbook_values():
+    assert sampling.sample_size(1_000_000) == 1066
+    assert sampling.sample_size(500) == 341
+    assert sampling.sample_size(50, margin=0.01) == 50
+
+def test_offsets_cover_population_in_strata():
+    offsets = sampling.sample_offsets(100_000, 1066, seed=1)
+    assert len(offsets) == 11
+    assert (np.diff(offsets) > 0).all()
+    assert offsets.min() >= 0 and offsets.max() + sampling.SAMPLE_PAGE <= 100_000
+    assert sampling.sample_offsets(900, 950) is None
+
+def test_estimates_shrink_with_finite_population():
+    df = pd.DataFrame({'sex': [1, 2] * 50, 'age': np.arange(20, 120) % 50 + 18, 'city': ['Владимир'] * 60 + ['Москва'] * 40})
+    large = sampling.sample_estimates(df, 1_000_000)
+    small = sampling.sample_estimates(df, 120)
+    assert large['female_share']['estimate'] == 0.5
+    assert large['female_share']['high'] - large['female_share']['low'] == pytest.approx(2 * 1.96 * 0.05, abs=1e-3)
+    assert small['female_share']['high'] - small['female_share']['low'] < large['female_share']['high'] - large['female_share']['low']
+    assert large['top_cities']['Владимир']['members'] == 600_000
+    assert large['age_mean']['low'] < large['age_mean']['estimate'] < large['age_mean']['high']
+
+def test_saved_estimates_replace_group_row():
+    df = pd.DataFrame({'sex': [1, 2], 'age': [20, 30]})
+    sampling.save_sample('rival', df, sampling.sample_estimates(df, 100))
+    sampling.save_sample('rival', df, sampling.sample_estimates(df, 200))
+    table = pd.read_csv(sampling.ESTIMATES_FILE, index_col='group')
+    assert table.loc['rival', 'population'] == 200
+    assert len(table) == 1
@@ -0,0 +1,30 @@
+import os
+import pandas as pd
+import pytest
+import snapshot_store
+
+def members(ids):
+    return pd.DataFrame({'id': ids, 'sex': [1] * len(ids), 'age': [30] * len(ids), 'city': ['Владимир'] * len(ids)})
+
+def test_snapshots_track_joined_and_left():
+    snapshot_store.record_snapshot('g', members([1, 2, 3]), collected_at=1_700_000_000)
+    row = snapshot_store.record_snapshot('g', members([2, 3, 4, 5]), collected_at=1_700_086_400)
+    assert (row['joined_count'], row['left_count']) == (2, 1)
+    snapshots = snapshot_store.load_snapshots('g')
+    assert snapshots['total_members'].tolist() == [3, 4]
+
+def test_failed_insert_keeps_previous_ids(monkeypatch):
+    snapshot_store.record_snapshot('g', members([1, 2, 3]), collected_at=1_700_000_000)
+
+    def broken(path=snapshot_store.SNAPSHOT_DB):
+        raise snapshot_store.sqlite3.OperationalError('database is locked')
+    with monkeypatch.context() as patch:
+        patch.setattr(snapshot_store, 'connect', broken)
+        with pytest.raises(snapshot_store.sqlite3.OperationalError):
+            snapshot_store.record_snapshot('g', members([7, 8]), collected_at=1_700_086_400)
+    row = snapshot_store.record_snapshot('g', members([1, 2, 3, 4]), collected_at=1_700_172_800)
+    assert (row['joined_count'], row['left_count']) == (1, 0)
+
+def test_empty_crawl_is_not_recorded():
+    assert snapshot_store.record_snapshot('g', pd.DataFrame()) is None
+    assert not os.path.exists(snapshot_store.SNAPSHOT_DB)
@@ -0,0 +1,34 @@
+import os
+import pandas as pd
+import subscriber_cache
+
+def write_subscribers(path, rows):
+    pd.DataFrame(rows, columns=['id', 'sex', 'age', 'city', 'last_seen']).to_csv(path, index=False)
+
+def test_round_trip_matches_csv():
+    write_subscribers('subs.csv', [
+        [1, 1, 25, 'Владимир', 1_700_000_000],
+        [2, 2, None, 'Москва', 1_700_086_400],
+        [3, 0, 40, None, None]
+    ])
+    cached = subscriber_cache.load_subscribers('subs.csv')
+    source = subscriber_cache.read_subscribers('subs.csv')
+    for column in source.columns:
+        assert cached[column].astype(object).equals(source[column].astype(object)), column
+    assert cached['last_seen'].iloc[0] == pd.Timestamp('2023-11-14 22:13:20')
+
+def test_columns_subset_and_rebuild_on_change():
+    write_subscribers('subs.csv', [[1, 1, 25, 'Владимир', 1_700_000_000]])
+    assert list(subscriber_cache.load_subscribers('subs.csv', columns=['age', 'missing'])) == ['age']
+    write_subscribers('subs.csv', [[1, 1, 25, 'Владимир', 1_700_000_000], [2, 2, 30, 'Москва', 1_700_000_000]])
+    os.utime('subs.csv', ns=(0, os.stat('subs.csv').st_mtime_ns + 10**9))
+    assert not subscriber_cache.is_fresh('subs.csv')
+    assert len(subscriber_cache.load_subscribers('subs.csv')) == 2
+    assert subscriber_cache.is_fresh('subs.csv')
+
+def test_missing_cache_falls_back_to_csv(monkeypatch):
+    write_subscribers('subs.csv', [[1, 1, 25, 'Владимир', 1_700_000_000]])
+    monkeypatch.setattr(subscriber_cache, 'build_cache', lambda path: None)
+    monkeypatch.setattr(subscriber_cache.time, 'sleep', lambda seconds: None)
+    df = subscriber_cache.load_subscribers('subs.csv', columns=['id', 'age'])
+    assert df.to_dict('list') == {'id': [1], 'age': [25]}
@@ -0,0 +1,37 @@
+import pandas as pd
+import timeseries
+from post_store import normalize_posts
+
+def posts(rows):
+    return normalize_posts(pd.DataFrame(rows, columns=['id', 'date', 'likes', 'reposts', 'comments', 'views']))
+
+def test_merge_rollup_replaces_touched_periods():
+    old = pd.DataFrame({col: [1, 1, 1] for col in timeseries.ROLLUP_COLUMNS},
+                       index=pd.to_datetime(['2024-01-01', '2024-01-08', '2024-01-15']))
+    new = pd.DataFrame({col: [5] for col in timeseries.ROLLUP_COLUMNS}, index=pd.to_datetime(['2024-01-15']))
+    touched = pd.to_datetime(['2024-01-08', '2024-01-15'])
+    merged = timeseries.merge_rollup(old, new, touched)
+    assert list(merged.index) == list(pd.to_datetime(['2024-01-01', '2024-01-15']))
+    assert merged.loc['2024-01-15', 'posts'] == 5
+
+def test_moved_post_empties_its_old_period():
+    timeseries.update_rollups('g', posts([
+        [1, '2024-01-02 10:00', 10, 1, 0, 100],
+        [2, '2024-01-16 10:00', 20, 2, 0, 200]
+    ]))
+    weekly = timeseries.load_rollup('g', 'weekly')
+    assert weekly['posts'].sum() == 2
+    changed = timeseries.update_rollups('g', posts([
+        [1, '2024-01-17 10:00', 12, 1, 0, 150],
+        [2, '2024-01-16 10:00', 20, 2, 0, 200]
+    ]))
+    assert changed == 1
+    weekly = timeseries.load_rollup('g', 'weekly')
+    assert list(weekly.index) == [pd.Timestamp('2024-01-15')]
+    assert weekly.loc['2024-01-15', 'posts'] == 2
+    assert weekly.loc['2024-01-15', 'likes'] == 32
+
+def test_unchanged_posts_are_not_reaggregated():
+    rows = [[1, '2024-01-02 10:00', 10, 1, 0, 100]]
+    assert timeseries.update_rollups('g', posts(rows)) == 1
+    assert timeseries.update_rollups('g', posts(rows)) == 0
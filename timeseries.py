@@ -0,0 +1,85 @@
+import pandas as pd
+import os
+from post_store import posts_files, load_posts, METRICS
+
+ROLLUPS_DIR = 'results/rollups'
+FREQUENCIES = {'daily': 'D', 'weekly': 'W', 'monthly': 'M'}
+ROLLUP_COLUMNS = ['posts'] + METRICS + ['engagement']
+
+def rollup_path(group, freq):
+    return f'{ROLLUPS_DIR}/{group}_{freq}.csv'
+
+def ledger_path(group):
+    return f'{ROLLUPS_DIR}/{group}_posts.csv'
+
+def load_ledger(group):
+    if not os.path.exists(ledger_path(group)):
+        columns = {col: pd.Series(dtype='int64') for col in ['id'] + METRICS + ['engagement']}
+        return pd.DataFrame({**columns, 'date': pd.Series(dtype='datetime64[ns]')})[['id', 'date'] + METRICS + ['engagement']]
+    return pd.read_csv(ledger_path(group), parse_dates=['date'])
+
+def aggregate(posts, freq):
+    keys = posts['date'].dt.to_period(FREQUENCIES[freq]).dt.start_time
+    agg = posts.groupby(keys.rename('period'))[METRICS + ['engagement']].sum()
+    agg.insert(0, 'posts', posts.groupby(keys.rename('period')).size())
+    return agg
+
+def load_rollup(group, freq):
+    path = rollup_path(group, freq)
+    if not os.path.exists(path):
+        return None
+    rollup = pd.read_csv(path, parse_dates=['period'])
+    return rollup.set_index('period')
+
+def merge_rollup(old, new, touched=None):
+    if old is None or old.empty:
+        return new
+    touched = new.index if touched is None else touched
+    return pd.concat([old.drop(index=touched, errors='ignore'), new])[ROLLUP_COLUMNS]
+
+def changed_posts(ledger, posts):
+    columns = ['id', 'date'] + METRICS + ['engagement']
+    merged = posts[columns].merge(ledger[columns], on='id', how='left', suffixes=('', '_old'), indicator=True)
+    changed = merged['_merge'] == 'left_only'
+    for col in columns[1:]:
+        changed |= merged[col].to_numpy() != merged[f'{col}_old'].to_numpy()
+    return posts[changed.to_numpy()]
+
+def update_rollups(group, posts):
+    os.makedirs(ROLLUPS_DIR, exist_ok=True)
+    ledger = load_ledger(group)
+    posts = posts.drop_duplicates('id', keep='last')
+    changed = changed_posts(ledger, posts)
+    if changed.empty:
+        return 0
+    old_dates = ledger.loc[ledger['id'].isin(changed['id']), 'date']
+    ledger = pd.concat([ledger[~ledger['id'].isin(changed['id'])], changed[ledger.columns]], ignore_index=True)
+    touched_dates = pd.concat([changed['date'], old_dates])
+    for freq, code in FREQUENCIES.items():
+        touched = touched_dates.dt.to_period(code).dt.start_time.unique()
+        periods = ledger['date'].dt.to_period(code).dt.start_time
+        fresh = aggregate(ledger[periods.isin(touched)], freq)
+        merged = merge_rollup(load_rollup(group, freq), fresh, touched)
+        merged.sort_index().to_csv(rollup_path(group, freq))
+    ledger.sort_values('id').to_csv(ledger_path(group), index=False)
+    return len(changed)
+
+def mean_engagement(group, freq):
+    rollup = load_rollup(group, freq)
+    if rollup is None:
+        posts = load_posts(group)
+        if posts is None:
+            return None
+        update_rollups(group, posts)
+        rollup = load_rollup(group, freq)
+        if rollup is None:
+            return None
+    return rollup['engagement'] / rollup['posts']
+
+def refresh_rollups():
+    for group in posts_files():
+        added = update_rollups(group, load_posts(group))
+        print(f"{group}: обновлено {added} постов в агрегатах")
+
+if __name__ == "__main__":
+    refresh_rollups()
@@ -1,14 +1,35 @@
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import pandas as pd
+import os
+from concurrent.futures import ProcessPoolExecutor
+from post_store import MAIN_GROUP
+from interests_engine import all_frequencies
 
-df = pd.read_csv('subscribers_cleaned.csv')
-all_interests = ' '.join(df['interests'].dropna())
+WORDCLOUD_DIR = 'graphs/wordclouds'
+MAX_WORDS = 200
 
-wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_interests)
+def wordcloud_path(group):
+    if group == MAIN_GROUP:
+        return 'graphs/interests_wordcloud.png'
+    return f'{WORDCLOUD_DIR}/{group}.png'
 
-plt.figure(figsize=(10, 5))
-plt.imshow(wordcloud, interpolation='bilinear')
-plt.axis("off")
-plt.savefig('graphs/interests_wordcloud.png')
-plt.show()
+def render_wordcloud(group, frequencies, path):
+    from wordcloud import WordCloud
+    wordcloud = WordCloud(width=800, height=400, background_color='white', max_words=MAX_WORDS)
+    wordcloud.generate_from_frequencies(frequencies).to_file(path)
+    return group
+
+def main():
+    os.makedirs(WORDCLOUD_DIR, exist_ok=True)
+    jobs = {
+        group: counts.head(MAX_WORDS).astype(int).to_dict()
+        for group, counts in all_frequencies().items() if not counts.empty
+    }
+    if not jobs:
+        print("Нет данных об интересах для облака слов")
+        return
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(render_wordcloud, group, words, wordcloud_path(group)) for group, words in jobs.items()]
+        for future in futures:
+            print(f"Облако слов сохранено: {wordcloud_path(future.result())}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,8 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
-from wordcloud import WordCloud
-from tqdm import tqdm
-
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-os.makedirs('graphs', exist_ok=True)
+from plotting import load_plotting
+from post_store import MAIN_GROUP
+from timeseries import mean_engagement
 
 def load_data():
     competitors = []
@@ -20,18 +15,21 @@ def load_data():
         main_df = pd.read_csv('results/posts_stats.csv')
         main_group = {
             'name': 'Laser33',
+            'key': MAIN_GROUP,
             'data': main_df
         }
     except Exception as e:
         print(f"Ошибка загрузки данных основной группы: {e}")
         main_group = None
     
+    from tqdm import tqdm
     for file in tqdm(os.listdir('competitors_data'), desc="Загрузка данных конкурентов"):
         if file.endswith('_content.csv'):
             try:
                 df = pd.read_csv(f'competitors_data/{file}')
                 competitors.append({
                     'name': file.replace('_content.csv', '').replace('_', ' '),
+                    'key': file.replace('_content.csv', ''),
                     'data': df
                 })
             except Exception as e:
@@ -44,6 +42,7 @@ def plot_content_distribution(competitors):
         print("Нет данных конкурентов для визуализации")
         return
     
+    plt, _ = load_plotting()
     plt.figure(figsize=(14, 8))
     
     def classify_content(text):
@@ -98,13 +97,11 @@ def plot_engagement_trends(main_group, competitors):
         print("Недостаточно данных для сравнения вовлеченности")
         return
     
+    plt, _ = load_plotting()
     plt.figure(figsize=(14, 8))
     
     try:
-        main_df = main_group['data']
-        main_df['date'] = pd.to_datetime(main_df['date'])
-        main_df['engagement'] = main_df['likes'] + main_df['reposts']*2
-        main_weekly = main_df.set_index('date').resample('W')['engagement'].mean()
+        main_weekly = mean_engagement(main_group['key'], 'weekly')
         plt.plot(main_weekly.index, main_weekly.values, 
                 label='Laser33 (основная)', linewidth=3, color='red')
     except Exception as e:
@@ -112,10 +109,7 @@ def plot_engagement_trends(main_group, competitors):
     
     for comp in competitors:
         try:
-            comp_df = comp['data']
-            comp_df['date'] = pd.to_datetime(comp_df['date'])
-            comp_df['engagement'] = comp_df['likes'] + comp_df['reposts']*2
-            weekly = comp_df.set_index('date').resample('W')['engagement'].mean()
+            weekly = mean_engagement(comp['key'], 'weekly')
             plt.plot(weekly.index, weekly.values, 
                     label=comp['name'], linestyle='--')
         except Exception as e:
@@ -128,7 +122,7 @@ def plot_engagement_trends(main_group, competitors):
     plt.savefig('graphs/engagement_trends.png')
     plt.close()
 
-if __name__ == "__main__":
+def main():
     print("=== Визуализация сравнения с конкурентами ===")
     main_group, competitors = load_data()
     plot_content_distribution(competitors)
@@ -136,3 +130,6 @@ if __name__ == "__main__":
     print("\nГрафики сохранены в папке graphs:")
     print("- content_types_comparison.png")
     print("- engagement_trends.png")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import time
+from datetime import datetime
+
+VERSION = '5.131'
+PAGE_SIZE = 100
+RETRIES = 3
+PAGE_DELAY = 0.5
+
+def fetch_page(vk_session, owner_id, offset, count, retries=RETRIES, params=None):
+    for attempt in range(retries):
+        try:
+            return vk_session.method('wall.get', {
+                **(params or {}),
+                'owner_id': owner_id,
+                'count': count,
+                'offset': offset,
+                'v': VERSION
+            })
+        except Exception as e:
+            if attempt == retries - 1:
+                raise
+            print(f"Ошибка при получении постов (попытка {attempt + 1}): {str(e)}")
+            time.sleep(2 * (attempt + 1))
+
+def iter_wall(vk_session, owner_id, since=None, page_size=PAGE_SIZE, retries=RETRIES, params=None):
+    offset = 0
+    while True:
+        page = fetch_page(vk_session, owner_id, offset, page_size, retries, params)
+        items = page.get('items', [])
+        if not items:
+            return
+        for post in items:
+            if since is not None and post['date'] < since:
+                if post.get('is_pinned'):
+                    continue
+                return
+            yield post
+        offset += len(items)
+        if offset >= page.get('count', 0):
+            return
+        time.sleep(PAGE_DELAY)
+
+def normalize_post(post):
+    return {
+        'id': post['id'],
+        'date': datetime.fromtimestamp(post['date']).strftime('%Y-%m-%d %H:%M'),
+        'text': post.get('text', ''),
+        'likes': post.get('likes', {}).get('count', 0),
+        'reposts': post.get('reposts', {}).get('count', 0),
+        'comments': post.get('comments', {}).get('count', 0),
+        'views': post.get('views', {}).get('count', 0),
+        'attachments': len(post.get('attachments', []))
+    }
+
+def iter_normalized_posts(vk_session, owner_id, since=None, page_size=PAGE_SIZE):
+    for post in iter_wall(vk_session, owner_id, since, page_size):
+        yield normalize_post(post)